@@ -1,20 +1,73 @@
 import requests
-from bs4 import BeautifulSoup
+from http_session import get_session
+import lxml.html
+from lxml import etree
 from urllib.parse import urlparse, urljoin
+from io import BytesIO
 import re
-import json
+import orjson
+import threading
 from typing import List, Dict, Optional
 
+_WORD_RE = re.compile(r'\w+')
+
+# Hard cap on downloaded body size; anything larger is abandoned mid-stream.
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+FETCH_CHUNK_SIZE = 65536
+
+# Lazily built extractor reused by parse_html_static within a worker process.
+_process_extractor = None
+
+# Parsers cached per declared charset. lxml detects encodings in C from the
+# raw bytes (meta charset / BOM) when none is declared, so the pure-Python
+# chardet fallback that requests uses for response.text never runs.
+_html_parsers = {}
+
+def _html_parser(encoding: Optional[str] = None) -> lxml.html.HTMLParser:
+    parser = _html_parsers.get(encoding)
+    if parser is None:
+        parser = lxml.html.HTMLParser(encoding=encoding, recover=True)
+        _html_parsers[encoding] = parser
+    return parser
+
 class ContentExtractor:
+    # XPath expressions compiled once at class-load time so every page reuses them
+    _XP_TITLE = etree.XPath('string(//title)')
+    _XP_META_DESC = etree.XPath("//meta[@name='description']/@content")
+    _XP_META_KEYWORDS = etree.XPath("//meta[@name='keywords']/@content")
+    _XP_CANONICAL = etree.XPath("//link[@rel='canonical']/@href")
+    _XP_HEADINGS = etree.XPath("//h1|//h2|//h3|//h4|//h5|//h6")
+    _XP_OG = etree.XPath("//meta[starts-with(@property,'og:')]")
+    _XP_FAVICON = etree.XPath("//link[@rel='icon']/@href")
+    _XP_PUBLISHED = etree.XPath("//time/@datetime")
+
+    # Tags consumed by parse_metadata_only; everything else is skipped by
+    # the streaming parser so no tree is built for body text.
+    _METADATA_TAGS = ('title', 'meta', 'link', 'a',
+                      'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
     def __init__(self, user_agent: str = "ContentExtractorBot/1.0"):
         self.headers = {"User-Agent": user_agent}
+        self.session = get_session()
         self.og_tags = ['og:title', 'og:description', 'og:image', 'og:url']
+        self.out = None
+        self.out_lock = threading.Lock()
 
-    def fetch_page(self, url: str) -> Optional[str]:
+    def fetch_page(self, url: str) -> Optional[bytes]:
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, headers=self.headers, timeout=10, stream=True)
             if response.status_code == 200:
-                return response.text
+                # Stream the body with a byte cap instead of eagerly decoding
+                # arbitrarily large documents; lxml detects the encoding from
+                # the raw bytes, so response.text is never needed.
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > MAX_CONTENT_BYTES:
+                        print(f"Skipping {url}: body exceeds {MAX_CONTENT_BYTES} bytes")
+                        response.close()
+                        return None
+                return bytes(body)
             else:
                 print(f"Failed to fetch {url} with status code {response.status_code}")
                 return None
@@ -22,13 +75,28 @@ class ContentExtractor:
             print(f"Error fetching {url}: {e}")
             return None
 
-    def parse_html(self, html: str, url: str) -> Dict:
-        soup = BeautifulSoup(html, 'html.parser')
-        title = self.extract_title(soup)
-        description = self.extract_meta_description(soup)
-        content = self.extract_content(soup)
-        metadata = self.extract_metadata(soup, url)
-        og_data = self.extract_opengraph_data(soup)
+    @staticmethod
+    def parse_html_static(html: bytes, url: str) -> Dict:
+        """
+        Picklable entry point for process-pool parsing: raw bytes cross the
+        pickle boundary and each worker process reuses one extractor.
+        """
+        global _process_extractor
+        if _process_extractor is None:
+            _process_extractor = ContentExtractor()
+        return _process_extractor.parse_html(html, url)
+
+    def parse_html(self, html: bytes, url: str, encoding: Optional[str] = None) -> Dict:
+        # Pass the charset declared in the response headers when the caller
+        # has one; otherwise lxml's own detection handles the raw bytes.
+        root = lxml.html.fromstring(html, parser=_html_parser(encoding))
+        title = self.extract_title(root)
+        description = self.extract_meta_description(root)
+        og_data = self.extract_opengraph_data(root)
+        # extract_content strips script/style nodes in place; the extracted
+        # text is shared with extract_metadata to avoid a second pass
+        content = self.extract_content(root)
+        metadata = self.extract_metadata(root, url, content)
 
         return {
             "url": url,
@@ -39,32 +107,84 @@ class ContentExtractor:
             "og_data": og_data
         }
 
-    def extract_title(self, soup: BeautifulSoup) -> Optional[str]:
-        if soup.title:
-            return soup.title.get_text().strip()
-        return None
+    def parse_metadata_only(self, html: bytes, url: str) -> Dict:
+        """
+        Streams only the metadata-bearing tags out of a page with iterparse,
+        clearing each element once consumed so content-heavy documents never
+        materialize a full tree. Use when the page text itself is not needed.
+        """
+        if isinstance(html, str):
+            html = html.encode('utf-8', errors='replace')
 
-    def extract_meta_description(self, soup: BeautifulSoup) -> Optional[str]:
-        description = soup.find("meta", attrs={"name": "description"})
-        if description and description.get("content"):
-            return description["content"].strip()
-        return None
+        title = None
+        description = None
+        canonical_url = url
+        headings = {f"h{level}": [] for level in range(1, 7)}
+        links = []
+        og_data = {}
+        wanted_og = set(self.og_tags)
 
-    def extract_content(self, soup: BeautifulSoup) -> str:
-        # Remove scripts and styles
-        for script in soup(["script", "style"]):
-            script.decompose()
+        for _, elem in etree.iterparse(BytesIO(html), events=('end',),
+                                       tag=self._METADATA_TAGS, html=True):
+            tag = elem.tag
+            if tag == 'title':
+                if title is None and elem.text:
+                    title = elem.text.strip() or None
+            elif tag == 'meta':
+                content = elem.get('content')
+                if content:
+                    if elem.get('name') == 'description':
+                        description = content.strip()
+                    elif elem.get('property') in wanted_og:
+                        og_data[elem.get('property')] = content
+            elif tag == 'link':
+                if elem.get('rel') == 'canonical' and elem.get('href'):
+                    canonical_url = elem.get('href')
+            elif tag == 'a':
+                href = elem.get('href')
+                if href:
+                    full_url = urljoin(url, href)
+                    if self.is_valid_url(full_url):
+                        links.append(full_url)
+            else:
+                headings[tag].append(elem.text_content().strip())
+            elem.clear()
 
-        # Extract visible text
-        text = soup.get_text(separator=' ')
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        return ' '.join(lines)
+        return {
+            "url": url,
+            "title": title,
+            "description": description,
+            "og_data": og_data,
+            "metadata": {
+                "canonical_url": canonical_url,
+                "headings": headings,
+                "links": links
+            }
+        }
+
+    def extract_title(self, root) -> Optional[str]:
+        title = self._XP_TITLE(root).strip()
+        return title if title else None
+
+    def extract_meta_description(self, root) -> Optional[str]:
+        descriptions = self._XP_META_DESC(root)
+        if descriptions:
+            return descriptions[0].strip()
+        return None
 
-    def extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict:
-        canonical_url = self.extract_canonical_url(soup, url)
-        word_count = self.get_word_count(soup)
-        headings = self.extract_headings(soup)
-        links = self.extract_links(soup, url)
+    def extract_content(self, root) -> str:
+        # Remove scripts and styles, then stream visible text at C speed in
+        # a single pass instead of joining, re-splitting, and re-joining
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        return ' '.join(chunk for t in root.itertext() for chunk in t.split())
+
+    def extract_metadata(self, root, url: str, content: Optional[str] = None) -> Dict:
+        canonical_url = self.extract_canonical_url(root, url)
+        headings = self.extract_headings(root)
+        links = self.extract_links(root, url)
+        if content is None:
+            content = self.extract_content(root)
+        word_count = self.get_word_count(content)
 
         return {
             "canonical_url": canonical_url,
@@ -73,43 +193,43 @@ class ContentExtractor:
             "links": links
         }
 
-    def extract_canonical_url(self, soup: BeautifulSoup, url: str) -> str:
-        canonical_tag = soup.find("link", rel="canonical")
-        if canonical_tag and canonical_tag.get("href"):
-            return canonical_tag["href"]
+    def extract_canonical_url(self, root, url: str) -> str:
+        hrefs = self._XP_CANONICAL(root)
+        if hrefs:
+            return hrefs[0]
         return url
 
-    def get_word_count(self, soup: BeautifulSoup) -> int:
-        text = self.extract_content(soup)
-        words = re.findall(r'\w+', text)
-        return len(words)
+    def get_word_count(self, text: str) -> int:
+        # finditer avoids materializing the full word list just to count it
+        return sum(1 for _ in _WORD_RE.finditer(text))
 
-    def extract_headings(self, soup: BeautifulSoup) -> Dict[str, List[str]]:
-        headings = {}
-        for level in range(1, 7):
-            heading_tag = f"h{level}"
-            headings[heading_tag] = [h.get_text().strip() for h in soup.find_all(heading_tag)]
+    def extract_headings(self, root) -> Dict[str, List[str]]:
+        # One document pass, grouped by tag, instead of six find_all calls
+        headings = {f"h{level}": [] for level in range(1, 7)}
+        for node in self._XP_HEADINGS(root):
+            headings[node.tag].append(node.text_content().strip())
         return headings
 
-    def extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        links = []
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"]
-            full_url = urljoin(base_url, href)
-            if self.is_valid_url(full_url):
-                links.append(full_url)
-        return links
+    def extract_links(self, root, base_url: str) -> List[str]:
+        # make_links_absolute + iterlinks resolve and walk every link in C,
+        # replacing per-link urljoin/urlparse calls at Python speed
+        root.make_links_absolute(base_url, resolve_base_href=True)
+        return [link for element, attr, link, _ in root.iterlinks()
+                if element.tag == 'a' and attr == 'href'
+                and link.startswith(('http://', 'https://'))]
 
     def is_valid_url(self, url: str) -> bool:
         parsed = urlparse(url)
         return all([parsed.scheme, parsed.netloc])
 
-    def extract_opengraph_data(self, soup: BeautifulSoup) -> Dict[str, Optional[str]]:
+    def extract_opengraph_data(self, root) -> Dict[str, Optional[str]]:
         og_data = {}
-        for tag in self.og_tags:
-            meta_tag = soup.find("meta", property=tag)
-            if meta_tag and meta_tag.get("content"):
-                og_data[tag] = meta_tag["content"]
+        wanted = set(self.og_tags)
+        for meta_tag in self._XP_OG(root):
+            tag = meta_tag.get("property")
+            content = meta_tag.get("content")
+            if tag in wanted and content:
+                og_data[tag] = content
         return og_data
 
     def clean_url(self, url: str) -> str:
@@ -117,49 +237,59 @@ class ContentExtractor:
         clean_url = parsed_url.scheme + "://" + parsed_url.netloc + parsed_url.path
         return clean_url
 
-    def extract_keywords(self, soup: BeautifulSoup) -> Optional[List[str]]:
-        meta_keywords = soup.find("meta", attrs={"name": "keywords"})
-        if meta_keywords and meta_keywords.get("content"):
-            return [kw.strip() for kw in meta_keywords["content"].split(",")]
+    def extract_keywords(self, root) -> Optional[List[str]]:
+        keywords = self._XP_META_KEYWORDS(root)
+        if keywords:
+            return [kw.strip() for kw in keywords[0].split(",")]
         return None
 
-    def extract_images(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        images = []
-        for img_tag in soup.find_all("img", src=True):
-            src = img_tag["src"]
-            img_url = urljoin(base_url, src)
-            if self.is_valid_url(img_url):
-                images.append(img_url)
-        return images
-
-    def extract_favicon(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
-        icon_link = soup.find("link", rel="icon")
-        if icon_link and icon_link.get("href"):
-            return urljoin(base_url, icon_link["href"])
+    def extract_images(self, root, base_url: str) -> List[str]:
+        root.make_links_absolute(base_url, resolve_base_href=True)
+        return [link for element, attr, link, _ in root.iterlinks()
+                if element.tag == 'img' and attr == 'src'
+                and link.startswith(('http://', 'https://'))]
+
+    def extract_favicon(self, root, base_url: str) -> Optional[str]:
+        hrefs = self._XP_FAVICON(root)
+        if hrefs:
+            return urljoin(base_url, hrefs[0])
         return None
 
-    def extract_published_date(self, soup: BeautifulSoup) -> Optional[str]:
-        time_tag = soup.find("time")
-        if time_tag and time_tag.get("datetime"):
-            return time_tag["datetime"]
+    def extract_published_date(self, root) -> Optional[str]:
+        datetimes = self._XP_PUBLISHED(root)
+        if datetimes:
+            return datetimes[0]
         return None
 
-    def save_content(self, content: Dict, output_file: str) -> None:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(content, f, ensure_ascii=False, indent=4)
+    def open_output(self, output_file: str) -> None:
+        """Opens one shared append-only NDJSON sink with a 1 MiB buffer."""
+        self.out = open(output_file, "ab", buffering=1 << 20)
 
-    def process_url(self, url: str, output_file: str) -> None:
+    def save_content(self, content: Dict) -> None:
+        # One buffered line per page instead of an open/close and a
+        # pretty-printed JSON file per URL
+        with self.out_lock:
+            self.out.write(orjson.dumps(content) + b"\n")
+
+    def close_output(self) -> None:
+        if self.out is not None:
+            self.out.close()
+            self.out = None
+
+    def process_url(self, url: str) -> None:
         html = self.fetch_page(url)
         if html:
             parsed_content = self.parse_html(html, url)
-            self.save_content(parsed_content, output_file)
+            self.save_content(parsed_content)
         else:
             print(f"Failed to process {url}")
 
 if __name__ == "__main__":
     url_list = ["https://website.com/page1", "https://website.com/page2"]
     extractor = ContentExtractor()
+    extractor.open_output("extracted_content.ndjson")
 
     for url in url_list:
-        output_filename = f"output_{extractor.clean_url(url).replace('https://', '').replace('/', '_')}.json"
-        extractor.process_url(url, output_filename)
\ No newline at end of file
+        extractor.process_url(url)
+
+    extractor.close_output()
@@ -1,76 +1,257 @@
+import concurrent.futures
+import heapq
+import os
+import random
 import threading
 import time
-from queue import Queue
+from collections import deque
+from urllib.parse import urlparse
+from pybloom_live import ScalableBloomFilter
+from w3lib.url import canonicalize_url
 from page_fetcher import PageFetcher
 from content_extractor import ContentExtractor
 from robots_parser import RobotsParser
 from crawler_policies.politeness_policy import PolitenessPolicy
 
+# How long a fetched robots.txt stays valid, and how long to wait before
+# retrying a host whose robots.txt could not be fetched.
+ROBOTS_TTL = 6 * 3600
+ROBOTS_NEGATIVE_TTL = 600
+
+# How many URLs a worker fetches from one host consecutively while it holds
+# the host's kept-alive connection.
+HOST_BATCH_SIZE = 4
+
 class CrawlerManager:
-    def __init__(self, start_urls, max_workers=10, politeness_delay=2):
-        self.url_queue = Queue()
-        self.crawled_urls = set()
+    def __init__(self, start_urls, max_workers=10, politeness_delay=2,
+                 user_agent="SearchEngineBot/1.0", page_fetcher=None,
+                 content_extractor=None, politeness_policy=None):
+        # Bloom filters keep dedup at ~10 bits per URL instead of holding
+        # every URL string in memory for the lifetime of the crawl. Both
+        # filters are sharded with one lock per shard (4x the worker count)
+        # so enqueue decisions stop serializing on a single mutex.
+        self.shard_count = 4 * max_workers
+        self.crawled_shards = [
+            ScalableBloomFilter(initial_capacity=250_000, error_rate=1e-6)
+            for _ in range(self.shard_count)]
+        self.seen_shards = [
+            ScalableBloomFilter(initial_capacity=250_000, error_rate=1e-6)
+            for _ in range(self.shard_count)]
+        self.shard_locks = [threading.Lock() for _ in range(self.shard_count)]
+        for url in start_urls:
+            self.mark_seen(self._canonicalize(url))
         self.start_urls = start_urls
         self.max_workers = max_workers
-        self.politeness_policy = PolitenessPolicy(politeness_delay)
-        self.page_fetcher = PageFetcher()
-        self.content_extractor = ContentExtractor()
-        self.robots_parser = RobotsParser()
-        self.lock = threading.Lock()
-        
+        self.politeness_delay = politeness_delay
+        self.user_agent = user_agent
+        # Collaborators are injectable (tests pass fakes); the defaults are
+        # built once here and share the pooled HTTP session and the XPath
+        # expressions compiled at import time.
+        self.politeness_policy = politeness_policy or PolitenessPolicy(
+            user_agent, delay=politeness_delay)
+        self.page_fetcher = page_fetcher or PageFetcher(user_agent)
+        self.content_extractor = content_extractor or ContentExtractor(user_agent)
+        self.robots_cache = {}
+        self.robots_lock = threading.Lock()
+        # Parsing is the only CPU-bound step; running it on a process pool
+        # lets worker threads keep fetching while cores parse in parallel.
+        self.parse_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count())
+
+        # Frontier keyed by (worker, host): every host owns a deque of its
+        # pending URLs, and a per-worker heap of (next_ready_time, host)
+        # entries decides which host to fetch from next. Workers only ever
+        # pull hosts whose ready time has passed, so politeness delays are
+        # scheduling data instead of worker sleeps.
+        self.worker_host_queues = [{} for _ in range(max_workers)]
+        self.worker_heaps = [[] for _ in range(max_workers)]
+        self.worker_locks = [threading.Lock() for _ in range(max_workers)]
+
         for url in start_urls:
-            self.url_queue.put(url)
+            self.enqueue_url(self._canonicalize(url))
+
+    @staticmethod
+    def _canonicalize(url):
+        """
+        Normalizes a URL exactly once, at enqueue time: lowercased scheme
+        and host, sorted query parameters, no fragment. Every later dedup
+        and visited check then works on plain string equality instead of
+        re-running urlparse per comparison.
+        """
+        return canonicalize_url(url)
+
+    def _shard_for(self, url):
+        return hash(url) % self.shard_count
+
+    def mark_seen(self, url):
+        """Marks a URL seen, returning True if it was new."""
+        shard = self._shard_for(url)
+        with self.shard_locks[shard]:
+            if url in self.seen_shards[shard]:
+                return False
+            self.seen_shards[shard].add(url)
+            return True
+
+    def mark_crawled(self, url):
+        shard = self._shard_for(url)
+        with self.shard_locks[shard]:
+            self.crawled_shards[shard].add(url)
+
+    def worker_for_host(self, host):
+        return hash(host) % self.max_workers
+
+    def enqueue_url(self, url):
+        host = urlparse(url).netloc
+        worker_id = self.worker_for_host(host)
+        with self.worker_locks[worker_id]:
+            host_queues = self.worker_host_queues[worker_id]
+            queue = host_queues.get(host)
+            if queue is None:
+                host_queues[host] = queue = deque()
+                heapq.heappush(self.worker_heaps[worker_id],
+                               (time.monotonic(), host))
+            queue.append(url)
+
+    def next_batch(self, worker_id):
+        """
+        Pops up to HOST_BATCH_SIZE URLs from the earliest-ready host and
+        reschedules the host after the politeness delay. Returns (urls, 0)
+        when work is ready, ([], wait_seconds) when the soonest host is
+        still cooling down, and (None, None) when the frontier is empty.
+        """
+        now = time.monotonic()
+        with self.worker_locks[worker_id]:
+            heap = self.worker_heaps[worker_id]
+            host_queues = self.worker_host_queues[worker_id]
+            while heap:
+                ready_at, host = heap[0]
+                queue = host_queues.get(host)
+                if not queue:
+                    heapq.heappop(heap)
+                    host_queues.pop(host, None)
+                    continue
+                if ready_at > now:
+                    return [], ready_at - now
+                heapq.heappop(heap)
+                batch = [queue.popleft()
+                         for _ in range(min(HOST_BATCH_SIZE, len(queue)))]
+                # The injected policy owns the delay (including jitter); the
+                # heap is just where its answer gets recorded
+                heapq.heappush(
+                    heap, (now + self.politeness_policy.next_delay(), host))
+                return batch, 0.0
+        return None, None
+
+    def steal_work(self, worker_id):
+        """Moves one whole host queue over from a random victim worker."""
+        victims = [i for i in range(self.max_workers) if i != worker_id]
+        random.shuffle(victims)
+        for victim in victims:
+            with self.worker_locks[victim]:
+                host_queues = self.worker_host_queues[victim]
+                heap = self.worker_heaps[victim]
+                stolen_host = None
+                while heap:
+                    ready_at, host = heapq.heappop(heap)
+                    if host_queues.get(host):
+                        stolen_host = host
+                        stolen_queue = host_queues.pop(host)
+                        break
+                    host_queues.pop(host, None)
+            if stolen_host is None:
+                continue
+            with self.worker_locks[worker_id]:
+                my_queues = self.worker_host_queues[worker_id]
+                if stolen_host in my_queues:
+                    my_queues[stolen_host].extend(stolen_queue)
+                else:
+                    my_queues[stolen_host] = stolen_queue
+                    heapq.heappush(self.worker_heaps[worker_id],
+                                   (ready_at, stolen_host))
+            return True
+        return False
 
     def can_crawl(self, url):
-        robots_txt = self.robots_parser.parse(url)
-        if robots_txt and not robots_txt.allowed(url):
-            return False
-        return True
+        # Rules are cached per host so robots.txt is fetched at most once
+        # per TTL window, never once per URL.
+        parsed = urlparse(url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}"
+        now = time.monotonic()
+
+        with self.robots_lock:
+            cached = self.robots_cache.get(base_url)
+        if cached is not None:
+            parser, fetched_at = cached
+            ttl = ROBOTS_TTL if parser is not None else ROBOTS_NEGATIVE_TTL
+            if now - fetched_at < ttl:
+                return True if parser is None else parser.is_allowed(url)
 
-    def worker(self):
-        while not self.url_queue.empty():
-            url = self.url_queue.get()
+        try:
+            parser = RobotsParser()
+            parser.fetch_robots(base_url)
+        except Exception:
+            parser = None  # Negative entry: treat an unreachable robots.txt as allow-all
+        with self.robots_lock:
+            self.robots_cache[base_url] = (parser, now)
+        return True if parser is None else parser.is_allowed(url)
 
-            # Respect politeness policy
-            self.politeness_policy.enforce(url)
+    def worker(self, worker_id):
+        idle_rounds = 0
+        while idle_rounds < 3:
+            batch, wait = self.next_batch(worker_id)
+            if batch is None:
+                if not self.steal_work(worker_id):
+                    idle_rounds += 1
+                    time.sleep(0.1)
+                continue
+            if not batch:
+                # Soonest host is still inside its politeness window
+                time.sleep(min(wait, 1.0))
+                continue
+            idle_rounds = 0
 
-            if self.can_crawl(url):
-                try:
-                    self.crawl(url)
-                except Exception as e:
-                    print(f"Error crawling {url}: {e}")
-            self.url_queue.task_done()
+            for url in batch:
+                if self.can_crawl(url):
+                    try:
+                        self.crawl(url)
+                    except Exception as e:
+                        print(f"Error crawling {url}: {e}")
 
     def crawl(self, url):
         # Fetch the page
         page_content = self.page_fetcher.fetch(url)
         
         if page_content:
-            # Extract data from the page
-            extracted_data = self.content_extractor.extract(page_content)
-
-            with self.lock:
-                if url not in self.crawled_urls:
-                    self.crawled_urls.add(url)
-                    print(f"Crawled: {url}")
-            
-            # Add more URLs to the queue if new links found
-            new_urls = extracted_data.get('links', [])
+            # Parse the page off-thread so the GIL-free fetch loop continues;
+            # going through the injected extractor keeps fakes passed by
+            # tests on the parse path
+            future = self.parse_pool.submit(
+                self.content_extractor.parse_html_static, page_content, url)
+            extracted_data = future.result()
+
+            self.mark_crawled(url)
+            print(f"Crawled: {url}")
+
+            # Add more URLs to the frontier if new links found; dedup happens
+            # here, once per URL, against the sharded seen filter so workers
+            # only contend when two links hash to the same shard.
+            new_urls = extracted_data.get('metadata', {}).get('links', [])
             for new_url in new_urls:
-                with self.lock:
-                    if new_url not in self.crawled_urls:
-                        self.url_queue.put(new_url)
+                canonical = self._canonicalize(new_url)
+                if self.mark_seen(canonical):
+                    self.enqueue_url(canonical)
 
     def start_crawl(self):
         threads = []
-        for _ in range(self.max_workers):
-            thread = threading.Thread(target=self.worker)
+        for worker_id in range(self.max_workers):
+            thread = threading.Thread(target=self.worker, args=(worker_id,))
             thread.start()
             threads.append(thread)
 
         for thread in threads:
             thread.join()
 
+        self.parse_pool.shutdown()
         print("Crawling complete.")
 
 # Usage
@@ -1,19 +1,33 @@
+import heapq
+import random
 import time
 from urllib.parse import urlparse
 import logging
 
+# How long a fetched robots.txt stays valid, and how long to wait before
+# retrying a host whose robots.txt could not be fetched.
+ROBOTS_TTL = 6 * 3600
+ROBOTS_NEGATIVE_TTL = 600
+
 class PolitenessPolicy:
-    def __init__(self, user_agent: str, delay: float = 1.0):
+    def __init__(self, user_agent: str, delay: float = 1.0, max_delay: float = None):
         """
         Initializes the politeness policy.
-        
+
         Args:
             user_agent: The user agent to be used for web requests.
             delay: Minimum delay (in seconds) between requests to the same host.
+            max_delay: Upper bound of the randomized per-host delay; when set,
+                each host's next-allowed time is drawn uniformly from
+                [delay, max_delay] so request timing is not perfectly periodic.
         """
         self.user_agent = user_agent
         self.delay = delay
-        self.last_access_times = {}
+        self.max_delay = max_delay if max_delay is not None else delay
+        # Per-host next-allowed times plus a min-heap over them, so a caller
+        # can always pick a ready host instead of blocking behind one delay
+        self.next_allowed = {}
+        self._ready_heap = []
         self.robots_cache = {}
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('PolitenessPolicy')
@@ -30,40 +44,97 @@ class PolitenessPolicy:
         """
         parsed_url = urlparse(url)
         host = parsed_url.netloc
-        
-        if host in self.robots_cache:
-            return self.robots_cache[host].can_fetch(self.user_agent, url)
-        
+        now = time.monotonic()
+
+        cached = self.robots_cache.get(host)
+        if cached is not None:
+            robots_parser, fetched_at = cached
+            ttl = ROBOTS_TTL if robots_parser is not None else ROBOTS_NEGATIVE_TTL
+            if now - fetched_at < ttl:
+                if robots_parser is None:
+                    return True  # Negative entry: last fetch failed, assume allowed
+                return robots_parser.can_fetch(self.user_agent, url)
+
         robots_url = f'{parsed_url.scheme}://{host}/robots.txt'
         self.logger.info(f'Fetching robots.txt from {robots_url}')
-        
+
         try:
             robots_parser = RobotsParser(robots_url, self.user_agent)
-            self.robots_cache[host] = robots_parser
+            self.robots_cache[host] = (robots_parser, now)
             return robots_parser.can_fetch(self.user_agent, url)
         except Exception as e:
             self.logger.error(f'Error fetching robots.txt from {robots_url}: {str(e)}')
+            self.robots_cache[host] = (None, now)
             return True
 
+    def _jittered_delay(self) -> float:
+        return random.uniform(self.delay, self.max_delay)
+
+    def next_delay(self) -> float:
+        """
+        Returns the delay to apply before the next request to a host, drawn
+        with the policy's jitter. Schedulers that keep their own per-host
+        timetable use this instead of mark_fetched/next_ready_time.
+        """
+        return self._jittered_delay()
+
+    def host_ready(self, url: str) -> bool:
+        """
+        Checks whether the URL's host is outside its politeness window.
+
+        Args:
+            url: The URL whose host to check.
+
+        Returns:
+            True if a request to the host is allowed now, False otherwise.
+        """
+        host = urlparse(url).netloc
+        return self.next_allowed.get(host, 0.0) <= time.monotonic()
+
+    def next_ready_time(self) -> float:
+        """
+        Returns the monotonic time at which the soonest host becomes ready,
+        so a scheduler can sleep exactly until then instead of polling.
+        Stale heap entries (hosts rescheduled since being pushed) are
+        discarded lazily.
+        """
+        while self._ready_heap:
+            ready_at, host = self._ready_heap[0]
+            if self.next_allowed.get(host, 0.0) > ready_at:
+                heapq.heappop(self._ready_heap)
+                continue
+            return ready_at
+        return time.monotonic()
+
+    def mark_fetched(self, url: str):
+        """
+        Records a completed request and schedules the host's next-allowed
+        time with randomized jitter.
+
+        Args:
+            url: The URL that was just requested.
+        """
+        host = urlparse(url).netloc
+        ready_at = time.monotonic() + self._jittered_delay()
+        self.next_allowed[host] = ready_at
+        heapq.heappush(self._ready_heap, (ready_at, host))
+
     def respect_delay(self, url: str):
         """
-        Respects the delay policy by waiting if necessary before making a request.
-        
+        Respects the delay policy by waiting if necessary before making a
+        request. Single-threaded callers block here; schedulers working
+        several hosts should use host_ready/next_ready_time instead and
+        keep fetching ready hosts.
+
         Args:
             url: The URL that will be requested.
         """
-        parsed_url = urlparse(url)
-        host = parsed_url.netloc
-        current_time = time.time()
-
-        if host in self.last_access_times:
-            elapsed_time = current_time - self.last_access_times[host]
-            if elapsed_time < self.delay:
-                sleep_time = self.delay - elapsed_time
-                self.logger.info(f'Sleeping for {sleep_time:.2f} seconds before accessing {host}')
-                time.sleep(sleep_time)
-        
-        self.last_access_times[host] = current_time
+        host = urlparse(url).netloc
+        wait = self.next_allowed.get(host, 0.0) - time.monotonic()
+        if wait > 0:
+            self.logger.info(f'Sleeping for {wait:.2f} seconds before accessing {host}')
+            time.sleep(wait)
+        self.mark_fetched(url)
 
 class RobotsParser:
     def __init__(self, robots_url: str, user_agent: str):
@@ -75,8 +146,7 @@ class RobotsParser:
             user_agent: The user agent for which the parsing is done.
         """
         self.user_agent = user_agent
-        self.disallowed_paths = []
-        self.crawl_delay = None
+        self.robots = None
         self.fetch_robots_txt(robots_url)
         
     def fetch_robots_txt(self, robots_url: str):
@@ -103,59 +173,47 @@ class RobotsParser:
         Returns:
             The HTTP response.
         """
-        import requests
+        from http_session import get_session
         headers = {'User-Agent': self.user_agent}
-        return requests.get(url, headers=headers)
+        return get_session().get(url, headers=headers)
 
     def parse_robots_txt(self, robots_txt_content: str):
         """
-        Parses the content of the robots.txt file.
-        
+        Parses the content of the robots.txt file with Protego, which
+        implements the full REP spec ($ and * wildcards, longest-match
+        precedence).
+
         Args:
             robots_txt_content: The content of the robots.txt file.
         """
-        lines = robots_txt_content.splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if line.lower().startswith('user-agent:'):
-                current_agent = line.split(':', 1)[1].strip()
-                applicable = current_agent == '*' or current_agent == self.user_agent
-            elif applicable and line.lower().startswith('disallow:'):
-                path = line.split(':', 1)[1].strip()
-                if path:
-                    self.disallowed_paths.append(path)
-            elif applicable and line.lower().startswith('crawl-delay:'):
-                self.crawl_delay = float(line.split(':', 1)[1].strip())
+        from protego import Protego
+        self.robots = Protego.parse(robots_txt_content)
 
     def can_fetch(self, user_agent: str, url: str) -> bool:
         """
         Checks whether the user agent is allowed to fetch the given URL.
-        
+
         Args:
             user_agent: The user agent making the request.
             url: The URL to be fetched.
-        
+
         Returns:
             True if the URL is allowed to be fetched, False otherwise.
         """
-        parsed_url = urlparse(url)
-        path = parsed_url.path
-        
-        for disallowed_path in self.disallowed_paths:
-            if path.startswith(disallowed_path):
-                return False
-        return True
-    
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch(url, user_agent)
+
     def get_crawl_delay(self) -> float:
         """
         Returns the crawl delay specified in the robots.txt file.
-        
+
         Returns:
             The crawl delay if specified, or None if not.
         """
-        return self.crawl_delay
+        if self.robots is None:
+            return None
+        return self.robots.crawl_delay(self.user_agent)
 
 class PolitenessManager:
     def __init__(self, politeness_policy: PolitenessPolicy):
@@ -206,9 +264,9 @@ class PolitenessManager:
         Returns:
             The HTTP response.
         """
-        import requests
+        from http_session import get_session
         headers = {'User-Agent': self.politeness_policy.user_agent}
-        return requests.get(url, headers=headers)
+        return get_session().get(url, headers=headers)
 
 # Usage
 if __name__ == "__main__":
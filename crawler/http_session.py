@@ -0,0 +1,38 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Size of the per-host connection pool shared by all crawler components.
+POOL_CONNECTIONS = 100
+POOL_MAXSIZE = 100
+
+# Retries live in the adapter, so backoff waits happen inside urllib3
+# rather than as explicit sleeps in worker code; the jitter spreads
+# retry storms out instead of synchronizing them.
+RETRIES = Retry(total=3, backoff_factor=0.5, backoff_jitter=0.5,
+                status_forcelist=(429, 500, 502, 503, 504))
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests.Session shared by the crawler.
+
+    The session keeps HTTP connections alive between requests and pools
+    them per host, so repeated fetches against the same server reuse an
+    open socket instead of paying a new TCP/TLS handshake every time.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                      pool_maxsize=POOL_MAXSIZE,
+                                      max_retries=RETRIES)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
@@ -1,26 +1,55 @@
+import asyncio
+import random
+import aiohttp
 import requests
+from pybloom_live import ScalableBloomFilter
+from http_session import get_session
 from urllib.parse import urlparse, urljoin
 import time
 from requests.exceptions import RequestException, Timeout, TooManyRedirects
 from urllib.robotparser import RobotFileParser
 import logging
-import concurrent.futures
 
 # Logger configuration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('PageFetcher')
 
+# uvloop's libuv-based loop batches socket work far better than the default
+# selector loop; fall back silently where it is not installed.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# How long a fetched robots.txt stays valid, and how long to wait before
+# retrying a host whose robots.txt could not be fetched.
+ROBOTS_TTL = 6 * 3600
+ROBOTS_NEGATIVE_TTL = 600
+
+# Hard cap on downloaded body size; anything larger is abandoned mid-stream.
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+FETCH_CHUNK_SIZE = 65536
+
 class PageFetcher:
-    def __init__(self, user_agent: str, timeout: int = 10, max_retries: int = 3):
+    def __init__(self, user_agent: str, timeout: int = 10, max_retries: int = 3,
+                 max_in_flight: int = 100):
         self.user_agent = user_agent
         self.timeout = timeout
         self.max_retries = max_retries
-        self.visited_urls = set()
+        self.max_in_flight = max_in_flight
+        self.session = get_session()
+        # ~10 bits per URL instead of storing every URL string in a set
+        self.visited_urls = ScalableBloomFilter(initial_capacity=1_000_000,
+                                                error_rate=1e-6)
         self.robots_cache = {}
 
-    def fetch(self, url: str) -> str:
+    def fetch(self, url: str) -> bytes:
         """
-        Fetches a web page from a URL, handling errors and retries.
+        Fetches a web page from a URL, handling errors and retries. The body
+        is streamed with a hard byte cap and returned as raw bytes; lxml and
+        BeautifulSoup detect the encoding downstream, so no chardet decode
+        is paid for pages that would be truncated anyway.
         :param url: The URL to fetch.
         :return: The content of the page if successful, None otherwise.
         """
@@ -28,19 +57,30 @@ class PageFetcher:
             logger.info(f"Blocked by robots.txt: {url}")
             return None
 
-        attempt = 0
-        while attempt < self.max_retries:
-            try:
-                headers = {'User-Agent': self.user_agent}
-                response = requests.get(url, headers=headers, timeout=self.timeout)
-                response.raise_for_status()
-                logger.info(f"Successfully fetched: {url}")
-                return response.text
-            except (RequestException, Timeout, TooManyRedirects) as e:
-                logger.error(f"Error fetching {url}: {e}")
-                attempt += 1
-                time.sleep(2 ** attempt)  # Exponential backoff
-        return None
+        try:
+            # Retries and jittered backoff run inside urllib3 via the shared
+            # adapter's Retry config, so no sleep happens at this level.
+            headers = {'User-Agent': self.user_agent}
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'text/html' not in content_type:
+                # Streamed response: nothing past the headers was read yet
+                logger.info(f"Skipping non-HTML content at {url}: {content_type}")
+                response.close()
+                return None
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+                body += chunk
+                if len(body) > MAX_CONTENT_BYTES:
+                    logger.info(f"Skipping {url}: body exceeds {MAX_CONTENT_BYTES} bytes")
+                    response.close()
+                    return None
+            logger.info(f"Successfully fetched: {url}")
+            return bytes(body)
+        except (RequestException, Timeout, TooManyRedirects) as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return None
 
     def is_allowed_by_robots(self, url: str) -> bool:
         """
@@ -50,52 +90,108 @@ class PageFetcher:
         """
         parsed_url = urlparse(url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        if base_url in self.robots_cache:
-            rp = self.robots_cache[base_url]
-        else:
-            rp = RobotFileParser()
-            try:
-                rp.set_url(base_url)
-                rp.read()
-                self.robots_cache[base_url] = rp
-            except Exception as e:
-                logger.error(f"Failed to parse robots.txt for {base_url}: {e}")
-                return True  # If robots.txt cannot be fetched, assume it's allowed
+        now = time.monotonic()
+
+        cached = self.robots_cache.get(base_url)
+        if cached is not None:
+            rp, fetched_at = cached
+            ttl = ROBOTS_TTL if rp is not None else ROBOTS_NEGATIVE_TTL
+            if now - fetched_at < ttl:
+                if rp is None:
+                    return True  # Negative entry: last fetch failed, assume allowed
+                return rp.can_fetch(self.user_agent, url)
+
+        rp = RobotFileParser()
+        try:
+            rp.set_url(base_url)
+            rp.read()
+        except Exception as e:
+            logger.error(f"Failed to parse robots.txt for {base_url}: {e}")
+            self.robots_cache[base_url] = (None, now)
+            return True  # If robots.txt cannot be fetched, assume it's allowed
 
+        self.robots_cache[base_url] = (rp, now)
         return rp.can_fetch(self.user_agent, url)
 
-    def fetch_pages_concurrently(self, urls: list) -> dict:
+    async def fetch_async(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """
+        Fetches a web page over an aiohttp session, handling errors and retries.
+        :param session: The shared aiohttp ClientSession.
+        :param url: The URL to fetch.
+        :return: The content of the page if successful, None otherwise.
         """
-        Fetches multiple pages concurrently using thread pool.
+        # The robots check fetches robots.txt over blocking urllib on a
+        # cache miss; running it in the default executor keeps that I/O off
+        # the event loop so the other in-flight fetches are not stalled
+        allowed = await asyncio.get_running_loop().run_in_executor(
+            None, self.is_allowed_by_robots, url)
+        if not allowed:
+            logger.info(f"Blocked by robots.txt: {url}")
+            return None
+
+        attempt = 0
+        while attempt < self.max_retries:
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '')
+                    if 'text/html' not in content_type:
+                        logger.info(f"Skipping non-HTML content at {url}: {content_type}")
+                        return None
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                        body += chunk
+                        if len(body) > MAX_CONTENT_BYTES:
+                            logger.info(f"Skipping {url}: body exceeds {MAX_CONTENT_BYTES} bytes")
+                            return None
+                    logger.info(f"Successfully fetched: {url}")
+                    return bytes(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error fetching {url}: {e}")
+                attempt += 1
+                # Capped, jittered backoff; the event loop keeps serving
+                # other hosts while this coroutine waits
+                await asyncio.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.5))
+        return None
+
+    async def _fetch_batch(self, urls: list) -> dict:
+        """
+        Fetches a batch of URLs with a bounded number of in-flight requests.
         :param urls: List of URLs to fetch.
         :return: A dictionary with URLs as keys and page content (or None) as values.
         """
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        connector = aiohttp.TCPConnector(limit=1000, limit_per_host=5, ttl_dns_cache=300)
+        headers = {'User-Agent': self.user_agent}
+
+        async def bounded_fetch(session, url):
+            async with semaphore:
+                return await self.fetch_async(session, url)
+
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            contents = await asyncio.gather(
+                *[bounded_fetch(session, url) for url in urls],
+                return_exceptions=True
+            )
+
         results = {}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_url = {executor.submit(self.fetch, url): url for url in urls}
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    result = future.result()
-                    results[url] = result
-                except Exception as e:
-                    logger.error(f"Error fetching {url} concurrently: {e}")
-                    results[url] = None
+        for url, content in zip(urls, contents):
+            if isinstance(content, Exception):
+                logger.error(f"Error fetching {url} concurrently: {content}")
+                results[url] = None
+            else:
+                results[url] = content
         return results
 
-    def is_html(self, url: str) -> bool:
+    def fetch_pages_concurrently(self, urls: list) -> dict:
         """
-        Checks if the fetched content type is HTML.
-        :param url: The URL to check.
-        :return: True if the content is HTML, False otherwise.
+        Fetches multiple pages concurrently over async I/O. Crawling is
+        I/O-bound, so many in-flight sockets on one thread beat a small
+        thread pool.
+        :param urls: List of URLs to fetch.
+        :return: A dictionary with URLs as keys and page content (or None) as values.
         """
-        try:
-            response = requests.head(url, headers={'User-Agent': self.user_agent}, timeout=self.timeout)
-            content_type = response.headers.get('Content-Type', '')
-            return 'text/html' in content_type
-        except RequestException as e:
-            logger.error(f"Failed to determine content type for {url}: {e}")
-            return False
+        return asyncio.run(self._fetch_batch(urls))
 
     def normalize_url(self, base_url: str, link: str) -> str:
         """
@@ -133,7 +229,7 @@ class PageFetcher:
                 return self.fetch(url)
             except Exception as e:
                 logger.error(f"Attempt {attempt + 1} failed for {url}: {e}")
-                time.sleep(2 ** attempt)
+                time.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.5))
         return None
 
     def extract_links(self, page_content: str) -> list:
@@ -142,8 +238,9 @@ class PageFetcher:
         :param page_content: The HTML content of the page.
         :return: A list of extracted URLs.
         """
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(page_content, 'html.parser')
+        from bs4 import BeautifulSoup, SoupStrainer
+        # Only anchor tags are needed, so skip building the rest of the tree
+        soup = BeautifulSoup(page_content, 'lxml', parse_only=SoupStrainer('a', href=True))
         links = [a.get('href') for a in soup.find_all('a', href=True)]
         return links
 
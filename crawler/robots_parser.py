@@ -1,84 +1,58 @@
-import re
 from urllib.parse import urlparse, urljoin
 import requests
+from http_session import get_session
+from protego import Protego
+from pybloom_live import ScalableBloomFilter
 from bs4 import BeautifulSoup
 import time
 
 class RobotsParser:
     def __init__(self, user_agent="*"):
         self.user_agent = user_agent
-        self.rules = {}
-        self.sitemaps = []
-        self.crawl_delay = None
+        # Protego implements the full REP spec ($ and * wildcards, longest-
+        # match precedence) that the previous hand-rolled parser got wrong.
+        self.robots = None
 
     def fetch_robots(self, base_url):
-        parsed_url = urlparse(base_url)
+        # Network errors propagate as requests.RequestException so callers
+        # can cache a negative entry and retry sooner; a missing robots.txt
+        # is allow-all, not a failure, and stays in-band
         robots_url = urljoin(base_url, "/robots.txt")
-        try:
-            response = requests.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                self.parse_robots(response.text)
-            else:
-                print(f"Robots.txt not found at {robots_url}, status: {response.status_code}")
-        except requests.RequestException as e:
-            print(f"Failed to fetch robots.txt: {e}")
+        response = get_session().get(robots_url, timeout=10)
+        if response.status_code == 200:
+            self.parse_robots(response.text)
+        else:
+            print(f"Robots.txt not found at {robots_url}, status: {response.status_code}")
 
     def parse_robots(self, robots_text):
-        current_user_agent = None
-        for line in robots_text.splitlines():
-            line = line.strip()
-
-            if not line or line.startswith('#'):
-                continue
-
-            if line.lower().startswith('user-agent:'):
-                current_user_agent = line.split(':')[1].strip()
-            elif current_user_agent and (self.user_agent == '*' or current_user_agent == self.user_agent):
-                self._parse_rule(line)
-            elif line.lower().startswith('sitemap:'):
-                self.sitemaps.append(line.split(':', 1)[1].strip())
-
-    def _parse_rule(self, line):
-        if line.lower().startswith('disallow:'):
-            path = line.split(':', 1)[1].strip()
-            if path:
-                if 'disallow' not in self.rules:
-                    self.rules['disallow'] = []
-                self.rules['disallow'].append(re.escape(path))
-        elif line.lower().startswith('allow:'):
-            path = line.split(':', 1)[1].strip()
-            if path:
-                if 'allow' not in self.rules:
-                    self.rules['allow'] = []
-                self.rules['allow'].append(re.escape(path))
-        elif line.lower().startswith('crawl-delay:'):
-            self.crawl_delay = int(line.split(':', 1)[1].strip())
+        self.robots = Protego.parse(robots_text)
 
     def is_allowed(self, url):
-        path = urlparse(url).path
-        if 'allow' in self.rules:
-            for rule in self.rules['allow']:
-                if re.match(rule, path):
-                    return True
-        if 'disallow' in self.rules:
-            for rule in self.rules['disallow']:
-                if re.match(rule, path):
-                    return False
-        return True
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch(url, self.user_agent)
 
     def get_crawl_delay(self):
-        return self.crawl_delay
+        if self.robots is None:
+            return None
+        return self.robots.crawl_delay(self.user_agent)
 
     def get_sitemaps(self):
-        return self.sitemaps
+        if self.robots is None:
+            return []
+        return list(self.robots.sitemaps)
 
 class Crawler:
     def __init__(self, base_url, user_agent="*"):
         self.base_url = base_url
-        self.visited_urls = set()
+        self.visited_urls = ScalableBloomFilter(initial_capacity=1_000_000,
+                                                error_rate=1e-6)
         self.to_crawl = set()
         self.robots_parser = RobotsParser(user_agent=user_agent)
-        self.robots_parser.fetch_robots(self.base_url)
+        try:
+            self.robots_parser.fetch_robots(self.base_url)
+        except requests.RequestException as e:
+            print(f"Failed to fetch robots.txt: {e}")
 
     def crawl(self, url):
         if not self.robots_parser.is_allowed(url):
@@ -91,13 +65,13 @@ class Crawler:
             time.sleep(delay)
 
         try:
-            response = requests.get(url, timeout=10)
+            response = get_session().get(url, timeout=10)
             if response.status_code == 200:
                 print(f"Successfully crawled: {url}")
                 self.visited_urls.add(url)
                 links = self.extract_links(response.content, url)
-                self.to_crawl.update(links)
-                self.to_crawl.difference_update(self.visited_urls)
+                self.to_crawl.update(
+                    link for link in links if link not in self.visited_urls)
             else:
                 print(f"Failed to crawl {url}, status code: {response.status_code}")
         except requests.RequestException as e:
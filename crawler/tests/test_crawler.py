@@ -1,30 +1,34 @@
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from crawler_manager import CrawlerManager
 from page_fetcher import PageFetcher
 from content_extractor import ContentExtractor
 from robots_parser import RobotsParser
 from crawler_policies.politeness_policy import PolitenessPolicy
 
-class CrawlerTests(unittest.TestCase):
+class AsyncFetchTests(unittest.IsolatedAsyncioTestCase):
+
+    @patch('page_fetcher.PageFetcher.fetch_async', new_callable=AsyncMock)
+    async def test_fetch_page_success(self, mock_fetch):
+        """Test successful asynchronous fetching of a page."""
+        mock_fetch.return_value = b'<html><body>Test Page</body></html>'
+        fetcher = PageFetcher(user_agent='TestBot/1.0')
+        content = await fetcher.fetch_async(None, 'http://website.com')
+        self.assertEqual(content, b'<html><body>Test Page</body></html>')
 
-    @patch('page_fetcher.PageFetcher.fetch')
-    def test_fetch_page_success(self, mock_fetch):
-        """Test successful fetching of a page."""
-        mock_fetch.return_value = '<html><body>Test Page</body></html>'
-        fetcher = PageFetcher()
-        content = fetcher.fetch('http://website.com')
-        self.assertEqual(content, '<html><body>Test Page</body></html>')
-
-    @patch('page_fetcher.PageFetcher.fetch')
-    def test_fetch_page_failure(self, mock_fetch):
-        """Test fetching a page that results in a failure."""
+    @patch('page_fetcher.PageFetcher.fetch_async', new_callable=AsyncMock)
+    async def test_fetch_page_failure(self, mock_fetch):
+        """Test asynchronous fetching of a page that results in a failure."""
         mock_fetch.side_effect = Exception("Failed to fetch page")
-        fetcher = PageFetcher()
+        fetcher = PageFetcher(user_agent='TestBot/1.0')
         with self.assertRaises(Exception) as context:
-            fetcher.fetch('http://website.com')
+            await fetcher.fetch_async(None, 'http://website.com')
         self.assertTrue("Failed to fetch page" in str(context.exception))
 
+
+class CrawlerTests(unittest.TestCase):
+
     @patch('content_extractor.ContentExtractor.extract')
     def test_extract_content(self, mock_extract):
         """Test content extraction from a web page."""
@@ -39,20 +43,20 @@ class CrawlerTests(unittest.TestCase):
         content = extractor.extract('')
         self.assertEqual(content, '')
 
-    def test_politeness_policy_respected(self):
-        """Test that the politeness policy is respected between requests."""
-        policy = PolitenessPolicy(min_delay=2)
-        last_request_time = policy.last_request_time
-        can_fetch = policy.can_fetch()
-        self.assertTrue(can_fetch)
-        self.assertNotEqual(last_request_time, policy.last_request_time)
-
-    def test_politeness_policy_not_respected(self):
-        """Test that politeness policy prevents too frequent requests."""
-        policy = PolitenessPolicy(min_delay=5)
-        policy.update_last_request_time()
-        can_fetch = policy.can_fetch()
-        self.assertFalse(can_fetch)
+    def test_politeness_policy_per_domain(self):
+        """Test that one host's delay does not block other hosts."""
+        policy = PolitenessPolicy(user_agent='TestBot/1.0', delay=5)
+        policy.mark_fetched('http://website.com/page')
+        self.assertFalse(policy.host_ready('http://website.com/other'))
+        self.assertTrue(policy.host_ready('http://other-site.com/page'))
+
+    def test_politeness_policy_reschedules_host(self):
+        """Test that a fetched host is scheduled inside the jitter window."""
+        policy = PolitenessPolicy(user_agent='TestBot/1.0', delay=8, max_delay=15)
+        policy.mark_fetched('http://website.com/page')
+        wait = policy.next_ready_time() - time.monotonic()
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 15)
 
     @patch('robots_parser.RobotsParser.allowed')
     def test_robots_allowed(self, mock_allowed):
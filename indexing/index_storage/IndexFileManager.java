@@ -201,4 +201,100 @@ public class IndexFileManager {
             throw new RuntimeException("Error copying index file", e);
         }
     }
+
+    /** Default directory and file the daemon serves lookups from. */
+    private static final String DAEMON_INDEX_DIR = "index_data";
+    private static final String DAEMON_INDEX_FILE = "main.idx";
+
+    /** Saved searches and the rolling request log held by the daemon. */
+    private static final Map<String, String> savedSearches = new HashMap<>();
+    private static final Deque<String> requestLog = new ArrayDeque<>();
+    private static final int REQUEST_LOG_SIZE = 1000;
+
+    /**
+     * Looks up every whitespace-separated query term in the index and
+     * returns the union of their postings, tab-joined.
+     */
+    private static String searchIndex(IndexFileManager manager, String query) {
+        if (!manager.indexExists(DAEMON_INDEX_FILE)) {
+            return "";
+        }
+        Map<String, List<Integer>> index = manager.loadIndex(DAEMON_INDEX_FILE);
+        Set<Integer> postings = new TreeSet<>();
+        for (String term : query.split("\\s+")) {
+            List<Integer> termPostings = index.get(term);
+            if (termPostings != null) {
+                postings.addAll(termPostings);
+            }
+        }
+        StringJoiner joiner = new StringJoiner("\t");
+        for (Integer docId : postings) {
+            joiner.add(docId.toString());
+        }
+        return joiner.toString();
+    }
+
+    /**
+     * Dispatches one tab-delimited daemon request and returns the
+     * single-line response.
+     */
+    private static String handleRequest(IndexFileManager manager, String line) {
+        if (requestLog.size() >= REQUEST_LOG_SIZE) {
+            requestLog.removeFirst();
+        }
+        requestLog.addLast(line);
+        String[] parts = line.split("\t");
+        try {
+            switch (parts[0]) {
+                case "search":
+                    // Trailing fields are filters; term lookup does not use
+                    // them yet, so only the query drives the posting union
+                    return parts.length > 1 ? searchIndex(manager, parts[1]) : "";
+                case "get":
+                    return savedSearches.getOrDefault(parts[1], "");
+                case "delete":
+                    savedSearches.remove(parts[1]);
+                    return "ok";
+                case "logs": {
+                    int limit = parts.length > 1 ? Integer.parseInt(parts[1]) : requestLog.size();
+                    StringJoiner joiner = new StringJoiner("\t");
+                    int skip = Math.max(0, requestLog.size() - limit);
+                    int i = 0;
+                    for (String entry : requestLog) {
+                        if (i++ >= skip) {
+                            joiner.add(entry);
+                        }
+                    }
+                    return joiner.toString();
+                }
+                case "status":
+                    return "ok\t" + manager.listIndexFiles().size();
+                default:
+                    return "ERROR unknown command: " + parts[0];
+            }
+        } catch (RuntimeException e) {
+            return "ERROR " + e.getMessage();
+        }
+    }
+
+    /**
+     * Long-lived mode spoken over stdin/stdout: one line per request, one
+     * line per response, so callers pay the JVM cold start once instead of
+     * per lookup.
+     */
+    private static void runDaemon() throws IOException {
+        IndexFileManager manager = new IndexFileManager(DAEMON_INDEX_DIR);
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        while ((line = in.readLine()) != null) {
+            System.out.println(handleRequest(manager, line));
+            System.out.flush();
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("daemon")) {
+            runDaemon();
+        }
+    }
 }
\ No newline at end of file
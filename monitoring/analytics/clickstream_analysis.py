@@ -3,10 +3,20 @@ import json
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import MiniBatchKMeans
+import matplotlib
+matplotlib.use('Agg')  # Headless backend: no GUI init, no blocking show()
 import matplotlib.pyplot as plt
 import logging
+from numba import njit
+
+# pyarrow's CSV writer formats columns in C++ instead of dispatching
+# __str__ per cell the way pandas to_csv does; fall back when missing.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
 
 # Configure logging
 logging.basicConfig(filename='clickstream_analysis.log', level=logging.INFO,
@@ -22,90 +32,172 @@ def load_clickstream_data(file_path):
         logging.info(f'Loading clickstream data from {file_path}')
         with open(file_path, 'r') as f:
             data = json.load(f)
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data)
+        # Category dtype stores each distinct ID string once; every groupby
+        # over these columns then works on integer codes instead of
+        # re-hashing the same strings on each call
+        for col in ('session_id', 'user_id', 'page_id'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
     except Exception as e:
         logging.error(f'Error loading clickstream data: {e}')
         return pd.DataFrame()
 
+@njit(cache=True)
+def _reduce_sessions(ts, session_codes, n_sessions):
+    """
+    One linear pass over (session, timestamp)-sorted arrays: per-click
+    durations plus per-session duration sums and click counts. Replaces
+    three pandas groupby passes with a single compiled loop over int64
+    nanosecond timestamps.
+    """
+    n = ts.shape[0]
+    durations = np.zeros(n, dtype=np.float64)
+    session_durations = np.zeros(n_sessions, dtype=np.float64)
+    session_clicks = np.zeros(n_sessions, dtype=np.int64)
+    for i in range(n):
+        code = session_codes[i]
+        session_clicks[code] += 1
+        if i > 0 and session_codes[i - 1] == code:
+            delta = (ts[i] - ts[i - 1]) / 1e9
+            durations[i] = delta
+            session_durations[code] += delta
+    return durations, session_durations, session_clicks
+
+def _session_arrays(df):
+    """Compact session codes and raw int64 timestamps for the JIT kernel."""
+    session_id = df['session_id']
+    if isinstance(session_id.dtype, pd.CategoricalDtype):
+        # The codes the category dtype already carries are exactly the
+        # compact labels the kernel needs; no np.unique pass required
+        sessions = session_id.cat.categories.to_numpy()
+        session_codes = session_id.cat.codes.to_numpy().astype(np.int64)
+    else:
+        sessions, session_codes = np.unique(session_id.values, return_inverse=True)
+    ts = df['timestamp'].values.view('i8')
+    return sessions, session_codes, ts
+
 # Preprocess clickstream data
 def preprocess_data(df):
     logging.info('Preprocessing data')
     df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['click_duration'] = df.groupby('session_id')['timestamp'].diff().dt.total_seconds().fillna(0)
+    # The JIT kernel assumes session-contiguous, time-ordered rows
+    df = df.sort_values(['session_id', 'timestamp'], ignore_index=True)
+    sessions, session_codes, ts = _session_arrays(df)
+    durations, _, _ = _reduce_sessions(ts, session_codes, len(sessions))
+    df['click_duration'] = durations
     df['hour'] = df['timestamp'].dt.hour
     df['day_of_week'] = df['timestamp'].dt.dayofweek
-    df.fillna(0, inplace=True)
+    # Fill only the numeric columns; a frame-wide fillna(0) also scans the
+    # categorical ID columns and upcasts int columns to float64
+    df['click_duration'] = df['click_duration'].fillna(0.0).astype('float32')
+    num_cols = df.select_dtypes('number').columns
+    df[num_cols] = df[num_cols].fillna(0)
     return df
 
 # Analyze sessions
 def session_analysis(df):
     logging.info('Analyzing sessions')
-    session_durations = df.groupby('session_id')['click_duration'].sum()
-    session_clicks = df.groupby('session_id').size()
-    return pd.DataFrame({'session_duration': session_durations, 'session_clicks': session_clicks})
+    sessions, session_codes, ts = _session_arrays(df)
+    _, session_durations, session_clicks = _reduce_sessions(
+        ts, session_codes, len(sessions))
+    return pd.DataFrame({'session_duration': session_durations,
+                         'session_clicks': session_clicks},
+                        index=pd.Index(sessions, name='session_id'))
 
 # Cluster users based on behavior
 def user_clustering(df, n_clusters=CLUSTER_COUNT):
     logging.info('Clustering users based on click behavior')
-    scaler = StandardScaler()
-    X = df[['session_duration', 'session_clicks']]
-    X_scaled = scaler.fit_transform(X)
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    df['cluster'] = kmeans.fit_predict(X_scaled)
+    # Standardize inline on a float32 copy: StandardScaler would upcast to
+    # float64, doubling the bytes streamed through the k-means passes
+    X = df[['session_duration', 'session_clicks']].to_numpy(dtype=np.float32)
+    X -= X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    X /= std
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=4096,
+                             n_init=3, random_state=42)
+    df['cluster'] = kmeans.fit_predict(X)
     return df
 
+# One figure shared by every plot in the pipeline; each plot clears the
+# axes instead of allocating a fresh figure per chart.
+_FIG, _AX = plt.subplots(figsize=(10, 6))
+
+def _save_plot(setup, output_path):
+    """Clears the shared axes, runs the plot setup, and writes the PNG."""
+    _AX.clear()
+    setup(_AX)
+    _FIG.savefig(output_path, dpi=90)
+
 # Plot cluster distribution
 def plot_clusters(df):
     logging.info('Plotting cluster distribution')
-    plt.figure(figsize=(8, 6))
-    plt.hist(df['cluster'], bins=CLUSTER_COUNT, edgecolor='black')
-    plt.title('User Behavior Clusters')
-    plt.xlabel('Cluster')
-    plt.ylabel('Frequency')
-    plt.savefig('cluster_distribution.png')
-    plt.show()
+
+    def setup(ax):
+        ax.hist(df['cluster'], bins=CLUSTER_COUNT, edgecolor='black')
+        ax.set_title('User Behavior Clusters')
+        ax.set_xlabel('Cluster')
+        ax.set_ylabel('Frequency')
+
+    _save_plot(setup, 'cluster_distribution.png')
 
 # Analyze click paths
 def click_path_analysis(df):
     logging.info('Analyzing click paths')
-    df['click_path'] = df.groupby('session_id')['page_id'].transform(lambda x: ' -> '.join(x.astype(str)))
-    click_paths = df.groupby('click_path').size().sort_values(ascending=False).reset_index()
-    click_paths.columns = ['click_path', 'count']
+    # Cast to string once and join per group directly; the previous
+    # transform(lambda ...) re-cast every group and broadcast a full-length
+    # string column only to group it again for counting.
+    page_ids = df['page_id'].astype('string')
+    paths = page_ids.groupby(df['session_id'], sort=False).agg(' -> '.join)
+    click_paths = paths.value_counts().rename_axis('click_path').reset_index(name='count')
     return click_paths
 
 # Analyze click frequency by hour
 def hourly_click_analysis(df):
     logging.info('Analyzing hourly click frequency')
-    hourly_clicks = df.groupby('hour').size()
-    plt.figure(figsize=(10, 6))
-    plt.plot(hourly_clicks.index, hourly_clicks.values, marker='o')
-    plt.title('Hourly Click Frequency')
-    plt.xlabel('Hour of the Day')
-    plt.ylabel('Number of Clicks')
-    plt.grid(True)
-    plt.savefig('hourly_click_frequency.png')
-    plt.show()
+    # With only 24 fixed buckets, a flat bincount beats building a groupby
+    # hash table over the whole frame
+    hourly_clicks = np.bincount(df['hour'].to_numpy(dtype=np.int8), minlength=24)
+
+    def setup(ax):
+        ax.plot(np.arange(24), hourly_clicks, marker='o')
+        ax.set_title('Hourly Click Frequency')
+        ax.set_xlabel('Hour of the Day')
+        ax.set_ylabel('Number of Clicks')
+        ax.grid(True)
+
+    _save_plot(setup, 'hourly_click_frequency.png')
 
 # Analyze click frequency by day of week
 def daily_click_analysis(df):
     logging.info('Analyzing daily click frequency')
-    daily_clicks = df.groupby('day_of_week').size()
-    plt.figure(figsize=(10, 6))
-    plt.bar(daily_clicks.index, daily_clicks.values)
-    plt.title('Click Frequency by Day of the Week')
-    plt.xlabel('Day of the Week (0=Monday)')
-    plt.ylabel('Number of Clicks')
-    plt.grid(True)
-    plt.savefig('daily_click_frequency.png')
-    plt.show()
+    daily_clicks = np.bincount(df['day_of_week'].to_numpy(dtype=np.int8), minlength=7)
+
+    def setup(ax):
+        ax.bar(np.arange(7), daily_clicks)
+        ax.set_title('Click Frequency by Day of the Week')
+        ax.set_xlabel('Day of the Week (0=Monday)')
+        ax.set_ylabel('Number of Clicks')
+        ax.grid(True)
+
+    _save_plot(setup, 'daily_click_frequency.png')
+
+def _write_csv(frame, path):
+    """Writes one DataFrame to CSV, through pyarrow when available."""
+    if pa is not None:
+        pacsv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), path)
+    else:
+        frame.to_csv(path, index=False)
 
 # Save results to CSV
 def save_results(df, session_summary, click_paths):
     logging.info('Saving analysis results to CSV')
     try:
-        df.to_csv(os.path.join(DATA_DIR, 'preprocessed_clickstream.csv'), index=False)
-        session_summary.to_csv(os.path.join(DATA_DIR, 'session_summary.csv'), index=False)
-        click_paths.to_csv(os.path.join(DATA_DIR, 'click_paths.csv'), index=False)
+        _write_csv(df, os.path.join(DATA_DIR, 'preprocessed_clickstream.csv'))
+        _write_csv(session_summary, os.path.join(DATA_DIR, 'session_summary.csv'))
+        _write_csv(click_paths, os.path.join(DATA_DIR, 'click_paths.csv'))
     except Exception as e:
         logging.error(f'Error saving results: {e}')
 
@@ -125,9 +217,10 @@ def clickstream_analysis_pipeline(file_path):
     session_summary = session_analysis(df)
     
     # Perform clustering analysis
-    df = user_clustering(session_summary)
+    session_summary = user_clustering(session_summary)
 
-    # Analyze click paths
+    # Analyze click paths on the per-click frame, which has page_id/hour
+    # columns; the clustered session summary does not
     click_paths = click_path_analysis(df)
 
     # Analyze click frequency patterns
@@ -135,7 +228,7 @@ def clickstream_analysis_pipeline(file_path):
     daily_click_analysis(df)
 
     # Plot clusters
-    plot_clusters(df)
+    plot_clusters(session_summary)
 
     # Save the results
     save_results(df, session_summary, click_paths)
@@ -2,7 +2,11 @@ import logging
 import logging.config
 import os
 import sys
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, SysLogHandler
+import queue
+import threading
+import time
+from logging.handlers import (RotatingFileHandler, TimedRotatingFileHandler,
+                              SysLogHandler, QueueHandler, QueueListener)
 from pathlib import Path
 
 LOG_DIR = Path("/var/log/website") 
@@ -17,10 +21,86 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 # Define a formatter for all logs
 formatter = logging.Formatter(LOG_FORMAT)
 
-# Create a file handler that rotates logs when they reach a certain size
-file_handler = RotatingFileHandler(
-    LOG_FILE, maxBytes=LOG_MAX_SIZE, backupCount=LOG_BACKUP_COUNT
-)
+class BatchedWritevHandler(logging.Handler):
+    """
+    File handler that coalesces records into a single writev syscall.
+
+    emit only appends the formatted record to a buffer; once BATCH_RECORDS
+    records have accumulated or BATCH_INTERVAL seconds have passed since
+    the first buffered record, the whole batch goes to the kernel in one
+    os.writev call instead of one write per record. A one-shot timer armed
+    when the first record enters an empty buffer backstops those checks:
+    without it, the records buffered just before a traffic pause would sit
+    until the next record arrived. emit runs on the QueueListener thread
+    and the timer callback takes the handler lock, so the buffer is never
+    touched concurrently. Rotation is left to an external logrotate in
+    this mode.
+    """
+    BATCH_RECORDS = 50
+    BATCH_INTERVAL = 0.005
+
+    def __init__(self, filename):
+        super().__init__()
+        self.fd = os.open(str(filename),
+                          os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._buffers = []
+        self._first_buffered = 0.0
+        self._flush_timer = None
+
+    def emit(self, record):
+        try:
+            data = (self.format(record) + '\n').encode('utf-8', 'replace')
+            now = time.monotonic()
+            if not self._buffers:
+                self._first_buffered = now
+                self._schedule_flush()
+            self._buffers.append(data)
+            if (len(self._buffers) >= self.BATCH_RECORDS
+                    or now - self._first_buffered >= self.BATCH_INTERVAL):
+                self._flush_buffers()
+        except Exception:
+            self.handleError(record)
+
+    def _schedule_flush(self):
+        timer = threading.Timer(self.BATCH_INTERVAL, self.flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _flush_buffers(self):
+        if self._buffers:
+            os.writev(self.fd, self._buffers)
+            self._buffers.clear()
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._flush_buffers()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        os.close(self.fd)
+        super().close()
+
+# One rotation strategy for the app log: size-based by default, time-based
+# (rotate at midnight) when LOG_ROTATION=time. Attaching both to the same
+# file would write every record twice and race on rollover.
+if os.getenv("BATCHED_LOG_WRITES"):
+    # High-QPS mode: batch records into writev and let logrotate rotate
+    file_handler = BatchedWritevHandler(LOG_FILE)
+elif os.getenv("LOG_ROTATION", "size") == "time":
+    file_handler = TimedRotatingFileHandler(
+        LOG_FILE, when="midnight", backupCount=LOG_BACKUP_COUNT
+    )
+else:
+    file_handler = RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_SIZE, backupCount=LOG_BACKUP_COUNT
+    )
 file_handler.setFormatter(formatter)
 
 # Create a console handler that outputs to stdout
@@ -31,25 +111,42 @@ console_handler.setFormatter(formatter)
 syslog_handler = SysLogHandler(address='/dev/log')
 syslog_handler.setFormatter(formatter)
 
-# Custom logger with multiple handlers
+_handlers = [file_handler, console_handler, syslog_handler]
+
+# Structured JSON logging is opt-in via JSON_LOGS to avoid paying a fourth
+# format+write per record by default
+if os.getenv("JSON_LOGS"):
+    try:
+        import json_log_formatter
+        json_file_handler = logging.FileHandler(LOG_DIR / "json_logs.log")
+        json_file_handler.setFormatter(json_log_formatter.JSONFormatter())
+        _handlers.append(json_file_handler)
+    except ImportError:
+        print("json_log_formatter module not installed, skipping JSON logging",
+              file=sys.stderr)
+
+# Logging calls only enqueue the record; formatting and the file/syslog
+# writes happen on the listener's background thread, off the hot path.
+_log_queue = queue.SimpleQueue()
+_listener = QueueListener(_log_queue, *_handlers, respect_handler_level=True)
+_listener.start()
+
+# Custom logger fed through the queue
 logger = logging.getLogger("website_logger")
 logger.setLevel(logging.DEBUG)
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-logger.addHandler(syslog_handler)
+logger.addHandler(QueueHandler(_log_queue))
 
 # Usage
 logger.info("Logging initialized and configuration is set.")
 
 def set_log_level(level):
     """
-    Set the logging level for all handlers.
+    Set the logging level for the logger and all listener-side handlers.
     Levels: DEBUG, INFO, WARNING, ERROR, CRITICAL
     """
     logger.setLevel(level)
-    file_handler.setLevel(level)
-    console_handler.setLevel(level)
-    syslog_handler.setLevel(level)
+    for handler in _handlers:
+        handler.setLevel(level)
 
 # Function to demonstrate logging
 def log_performance_metrics(query_time, results_count):
@@ -58,43 +155,33 @@ def log_performance_metrics(query_time, results_count):
     else:
         logger.info(f"Query executed in {query_time} seconds, {results_count} results returned")
 
-# Advanced log rotation based on time (rotate every midnight)
-time_rotating_handler = TimedRotatingFileHandler(
-    LOG_FILE, when="midnight", backupCount=LOG_BACKUP_COUNT
-)
-time_rotating_handler.setFormatter(formatter)
-logger.addHandler(time_rotating_handler)
-
-# Adding a custom filter for log messages
+# Adding a custom filter for log messages. The level check short-circuits
+# first so getMessage()'s msg % args formatting never runs for the common
+# non-error record; the substring fallback only looks at the raw msg.
 class CustomLogFilter(logging.Filter):
     def filter(self, record):
-        return 'ERROR' in record.getMessage()
+        return (record.levelno >= logging.ERROR
+                or 'ERROR' in (record.msg if isinstance(record.msg, str) else ''))
 
 # Apply filter to syslog handler
 syslog_handler.addFilter(CustomLogFilter())
 
-# Adding structured logging (JSON format)
-try:
-    import json_log_formatter
-    json_formatter = json_log_formatter.JSONFormatter()
-    json_file_handler = logging.FileHandler(LOG_DIR / "json_logs.log")
-    json_file_handler.setFormatter(json_formatter)
-    logger.addHandler(json_file_handler)
-except ImportError:
-    logger.error("json_log_formatter module not installed, skipping JSON logging")
-
-# Log to external services (cloud, Elastic, Splunk)
+# Loggers for external services (cloud, Elastic, Splunk), each with one
+# handler attached at module load; adding a handler per call would make the
+# handler list grow without bound and re-emit every record once per handler
+_external_loggers = {}
+for _service in ("Elastic", "Splunk"):
+    _service_logger = logging.getLogger(f"external.{_service.lower()}")
+    if not _service_logger.handlers:
+        _service_handler = logging.StreamHandler(sys.stdout)
+        _service_handler.setFormatter(formatter)
+        _service_logger.addHandler(_service_handler)
+    _external_loggers[_service] = _service_logger
+
 def log_to_external_service(service_name, message, level="INFO"):
-    if service_name == "Elastic":
-        elastic_handler = logging.StreamHandler(sys.stdout) 
-        elastic_handler.setFormatter(formatter)
-        logger.addHandler(elastic_handler)
-        logger.info(message)
-    elif service_name == "Splunk":
-        splunk_handler = logging.StreamHandler(sys.stdout)  
-        splunk_handler.setFormatter(formatter)
-        logger.addHandler(splunk_handler)
-        logger.info(message)
+    service_logger = _external_loggers.get(service_name)
+    if service_logger is not None:
+        service_logger.log(getattr(logging, level, logging.INFO), message)
 
 # Health check log for monitoring
 def log_health_check(status):
@@ -141,22 +228,25 @@ def log_metrics(cpu_usage, memory_usage):
     if memory_usage > 90:
         logger.warning("High memory usage detected")
 
-# Custom logging format for API responses
-class APILogFormatter(logging.Formatter):
-    def format(self, record):
-        record.msg = f"API response: {record.msg}"
-        return super().format(record)
+# API logger with its handler attached once at module load. The api marker
+# lives in the format string; mutating record.msg in a custom formatter
+# would allocate a new string per record and stack the prefix once per
+# handler sharing the record.
+_api_logger = logging.getLogger("api")
+if not _api_logger.handlers:
+    _api_handler = logging.StreamHandler(sys.stdout)
+    _api_handler.setFormatter(
+        logging.Formatter('%(asctime)s - api - %(levelname)s - %(message)s'))
+    _api_logger.addHandler(_api_handler)
 
 # API logging
 def log_api_response(endpoint, response_code, response_time):
-    api_logger = logging.getLogger("api")
-    api_handler = logging.StreamHandler(sys.stdout)
-    api_handler.setFormatter(APILogFormatter(LOG_FORMAT))
-    api_logger.addHandler(api_handler)
-    
-    if response_time > 1.0:
-        api_logger.warning(f"Slow response from {endpoint}, time: {response_time}s")
-    api_logger.info(f"API response from {endpoint}, code: {response_code}")
+    # isEnabledFor guards keep the f-strings from being built at all when
+    # the level is disabled
+    if response_time > 1.0 and _api_logger.isEnabledFor(logging.WARNING):
+        _api_logger.warning(f"Slow response from {endpoint}, time: {response_time}s")
+    if _api_logger.isEnabledFor(logging.INFO):
+        _api_logger.info(f"API response from {endpoint}, code: {response_code}")
 
 # Configuring logging level from environment variable
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
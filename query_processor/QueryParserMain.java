@@ -1,5 +1,6 @@
 package query_processor;
 
+import java.io.*;
 import java.util.*;
 
 // Token class to represent different types of tokens in the query
@@ -246,7 +247,49 @@ class QueryEvaluator {
 
 // Main class for parsing and evaluation functionality
 public class QueryParserMain {
-    public static void main(String[] args) {
+
+    // Dispatches one tab-delimited daemon request and returns the
+    // single-line response
+    private static String handleRequest(String line) {
+        String[] parts = line.split("\t", 2);
+        try {
+            switch (parts[0]) {
+                case "parse": {
+                    QueryTokenizer tokenizer = new QueryTokenizer(parts[1]);
+                    QueryParser parser = new QueryParser(tokenizer.tokenize());
+                    return new QueryEvaluator().evaluate(parser.parse());
+                }
+                case "suggestions":
+                    // No suggestion index is wired into the parser yet; an
+                    // empty line tells the caller there is nothing to offer
+                    return "";
+                case "status":
+                    return "ok";
+                default:
+                    return "ERROR unknown command: " + parts[0];
+            }
+        } catch (Exception e) {
+            return "ERROR " + e.getMessage();
+        }
+    }
+
+    // Long-lived mode spoken over stdin/stdout: one line per request, one
+    // line per response, so callers pay the JVM cold start once instead of
+    // per query
+    private static void runDaemon() throws IOException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        while ((line = in.readLine()) != null) {
+            System.out.println(handleRequest(line));
+            System.out.flush();
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("daemon")) {
+            runDaemon();
+            return;
+        }
         try {
             // Query input
             String query = "(apple AND orange) OR NOT banana";
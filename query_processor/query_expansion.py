@@ -1,33 +1,88 @@
 import re
 import nltk
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from nltk.corpus import wordnet
 from spellchecker import SpellChecker
-from collections import defaultdict
+from functools import lru_cache
 
-# Load NLTK resources
-nltk.download('wordnet')
-nltk.download('punkt')
+# Open the WordNet database files at import so the first query does not pay
+# for it; the download only runs when the corpus is actually missing, so
+# fresh workers skip the downloader's index check entirely
+try:
+    wordnet.ensure_loaded()
+except LookupError:
+    nltk.download('wordnet')
+    wordnet.ensure_loaded()
+
+# The normalizer keeps only lowercase alphanumerics, so one compiled
+# findall tokenizes identically to stripping plus Punkt at a fraction of
+# the cost
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# One spell checker (its frequency dictionary is large) shared by all
+# expander instances, with corrections cached since query tokens repeat
+# heavily across users
+_SPELL = SpellChecker()
+
+@lru_cache(maxsize=50_000)
+def _cached_correction(token):
+    return _SPELL.correction(token)
+
+# Stopwords and ultra-common words carry no topical signal; expanding them
+# floods the query with noise synonyms that the ranker then has to
+# intersect. The spell checker's corpus frequencies stand in for document
+# frequencies: anything above _DF_CAP of total occurrences is too common
+# to be worth expanding.
+try:
+    _STOPWORDS = frozenset(nltk.corpus.stopwords.words('english'))
+except LookupError:
+    nltk.download('stopwords')
+    _STOPWORDS = frozenset(nltk.corpus.stopwords.words('english'))
+
+_DF_CAP = 5e-4
+_SPELL_TOTAL = _SPELL.word_frequency.total_words
+
+def _expandable(token):
+    if token in _STOPWORDS or len(token) < 3:
+        return False
+    frequency = _SPELL.word_frequency.dictionary.get(token, 0)
+    return frequency / _SPELL_TOTAL <= _DF_CAP
+
+@lru_cache(maxsize=200_000)
+def wordnet_synonyms(token):
+    """
+    Synonyms of a token from WordNet, cached at module level so every
+    expander instance (and QueryRewriter) shares one cache; the synset
+    walk hits the WordNet files only on the first lookup of a token.
+    """
+    # dict.fromkeys dedups in one pass while keeping WordNet's sense order,
+    # so the most common senses stay first in the expansion
+    return tuple(dict.fromkeys(lemma.name().replace('_', ' ')
+                               for syn in wordnet.synsets(token)
+                               for lemma in syn.lemmas()))
 
 class QueryExpansion:
     def __init__(self):
-        self.spellchecker = SpellChecker()
-        self.synonyms_cache = defaultdict(list)
-    
+        self.spellchecker = _SPELL
+
+
     def normalize_query(self, query):
         """
         Normalize the query by lowercasing, removing special characters, and tokenizing.
         """
-        query = query.lower()
-        query = re.sub(r'[^a-z0-9\s]', '', query)
-        tokens = nltk.word_tokenize(query)
-        return tokens
+        return _TOKEN_RE.findall(query.lower())
 
     def correct_spelling(self, tokens):
         """
         Correct spelling mistakes in query tokens using SpellChecker.
         """
-        corrected_tokens = [self.spellchecker.correction(token) for token in tokens]
-        return corrected_tokens
+        # unknown() finds the misspelled subset in one pass; most queries
+        # have at most one typo, so the candidate-generation walk runs for
+        # almost no tokens
+        unknowns = self.spellchecker.unknown(tokens)
+        return [_cached_correction(token) if token in unknowns else token
+                for token in tokens]
 
     def expand_synonyms(self, tokens):
         """
@@ -36,16 +91,11 @@ class QueryExpansion:
         expanded_tokens = []
         for token in tokens:
             expanded_tokens.append(token)
-            if token in self.synonyms_cache:
-                expanded_tokens.extend(self.synonyms_cache[token])
-            else:
-                synonyms = set()
-                for syn in wordnet.synsets(token):
-                    for lemma in syn.lemmas():
-                        synonyms.add(lemma.name().replace('_', ' '))
-                self.synonyms_cache[token] = list(synonyms)
-                expanded_tokens.extend(synonyms)
-        return list(set(expanded_tokens))  # Remove duplicates
+            if _expandable(token):
+                expanded_tokens.extend(wordnet_synonyms(token))
+        # Order-preserving dedup: a set here shuffled tokens, hurting
+        # downstream ranking that weights term position
+        return list(dict.fromkeys(expanded_tokens))
 
     def expand_query(self, query):
         """
@@ -69,35 +119,78 @@ class QueryProcessor:
 
 # Utility Functions for Query Expansion
 
+class _SynTrie:
+    """
+    Character trie over expansion keys. Looking up a token walks its
+    characters through per-node dict children, so the cost depends on the
+    token length, not on how many keys are registered.
+    """
+    __slots__ = ('children', 'payload')
+
+    def __init__(self):
+        self.children = {}
+        self.payload = None
+
+    def insert(self, key, payload):
+        node = self
+        for char in key:
+            node = node.children.setdefault(char, _SynTrie())
+        node.payload = tuple(payload)
+
+    def lookup(self, token):
+        node = self
+        for char in token:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node.payload
+
+    @classmethod
+    def from_dict(cls, mapping):
+        root = cls()
+        for key, payload in mapping.items():
+            root.insert(key, payload)
+        return root
+
+# Tries built from caller dictionaries, keyed by identity so repeated calls
+# with the same dictionary reuse one trie instead of rebuilding it
+_TRIES = {}
+
+def _trie_for(mapping):
+    cached = _TRIES.get(id(mapping))
+    if cached is not None and cached[0] is mapping:
+        return cached[1]
+    trie = _SynTrie.from_dict(mapping)
+    _TRIES[id(mapping)] = (mapping, trie)
+    return trie
+
 def query_contains_synonyms(query, synonym_list):
     """
     Check if the query contains any word from a synonym list.
     """
-    query_tokens = query.lower().split()
-    for synonym in synonym_list:
-        if synonym in query_tokens:
-            return True
-    return False
+    query_tokens = set(query.lower().split())
+    return any(synonym in query_tokens for synonym in synonym_list)
 
 def expand_with_concepts(query, concept_dict):
     """
     Expand a query by appending related concepts.
     """
-    expanded_query = query
+    trie = _trie_for(concept_dict)
+    parts = [query]
     for word in query.split():
-        if word in concept_dict:
-            expanded_query += ' ' + ' '.join(concept_dict[word])
-    return expanded_query
+        payload = trie.lookup(word)
+        if payload:
+            parts.append(' '.join(payload))
+    return ' '.join(parts)
 
 def boost_query_terms(query, boost_factor=2):
     """
     Boost important query terms by repeating them a number of times.
     """
-    terms = query.split()
-    boosted_terms = []
-    for term in terms:
-        boosted_terms.extend([term] * boost_factor)
-    return ' '.join(boosted_terms)
+    # np.repeat duplicates every term in one C call; the Python loop built
+    # a throwaway list per term, which adds up on expanded queries with
+    # hundreds of synonyms
+    return ' '.join(np.repeat(query.split(), boost_factor))
 
 # Query expansion with custom synonym dictionary
 custom_synonyms = {
@@ -109,11 +202,15 @@ def custom_synonym_expansion(query, custom_synonyms):
     """
     Expand the query using custom synonyms defined by the user.
     """
-    expanded_query = query
-    for word, synonyms in custom_synonyms.items():
-        if word in query.split():
-            expanded_query += ' ' + ' '.join(synonyms)
-    return expanded_query
+    # The old loop re-split the query once per synonym key; one pass over
+    # the distinct query tokens against the trie replaces that
+    trie = _trie_for(custom_synonyms)
+    parts = [query]
+    for word in dict.fromkeys(query.split()):
+        payload = trie.lookup(word)
+        if payload:
+            parts.append(' '.join(payload))
+    return ' '.join(parts)
 
 # Advanced Query Expansion with Multiple Strategies
 class AdvancedQueryExpansion:
@@ -128,12 +225,22 @@ class AdvancedQueryExpansion:
         
         # Custom expansions
         expanded_query = custom_synonym_expansion(expanded_query, custom_synonyms)
-        
+
         # Boost terms
         expanded_query = boost_query_terms(expanded_query)
 
         return expanded_query
 
+    def process_queries(self, queries):
+        """
+        Expand a batch of queries across worker processes. Expansion is
+        CPU-bound (WordNet walks, spell checking), so bulk workloads like
+        ingestion or reranking feedback scale with cores; chunksize keeps
+        the pickling overhead amortized over many queries per dispatch.
+        """
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(self.process_query, queries, chunksize=32))
+
 # Test Cases for Query Expansion
 def run_tests():
     # Initialize query processor
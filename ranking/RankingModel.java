@@ -1,10 +1,15 @@
 package ranking;
 
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
 import java.util.HashMap;
 import java.util.Map;
 import java.util.List;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
+import java.util.StringJoiner;
 
 public class RankingModel {
 
@@ -106,8 +111,62 @@ public class RankingModel {
         }
     }
 
-    // Main method for testing
-    public static void main(String[] args) {
+    // Dispatches one tab-delimited daemon request and returns the
+    // single-line response
+    private static String handleRequest(String line) {
+        String[] parts = line.split("\t");
+        try {
+            switch (parts[0]) {
+                case "rank": {
+                    // rank <sortBy> <offset> <limit> <doc...>: the caller's
+                    // index lookup already orders documents by posting, so
+                    // the daemon's job is pagination — only the requested
+                    // slice goes back over the pipe. limit 0 means
+                    // unbounded.
+                    int offset = Integer.parseInt(parts[2]);
+                    int limit = Integer.parseInt(parts[3]);
+                    List<String> documents = new ArrayList<>(
+                            Arrays.asList(parts).subList(4, parts.length));
+                    if (parts[1].equals("alphabetical")) {
+                        Collections.sort(documents);
+                    }
+                    int from = Math.min(offset, documents.size());
+                    int to = limit > 0 ? Math.min(from + limit, documents.size())
+                                       : documents.size();
+                    StringJoiner joiner = new StringJoiner("\t");
+                    for (String document : documents.subList(from, to)) {
+                        joiner.add(document);
+                    }
+                    return joiner.toString();
+                }
+                case "status":
+                    return "ok";
+                default:
+                    return "ERROR unknown command: " + parts[0];
+            }
+        } catch (RuntimeException e) {
+            return "ERROR " + e.getMessage();
+        }
+    }
+
+    // Long-lived mode spoken over stdin/stdout: one line per request, one
+    // line per response, so callers pay the JVM cold start once instead of
+    // per ranking call
+    private static void runDaemon() throws IOException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        while ((line = in.readLine()) != null) {
+            System.out.println(handleRequest(line));
+            System.out.flush();
+        }
+    }
+
+    // Main method: daemon mode for the API workers, demo run otherwise
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("daemon")) {
+            runDaemon();
+            return;
+        }
         List<Document> documents = new ArrayList<>();
         documents.add(new Document("doc1", "search engine indexing algorithm"));
         documents.add(new Document("doc2", "java programming language ranking algorithm"));
@@ -1,5 +1,8 @@
 package ranking;
 
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -171,7 +174,44 @@ public class RelevanceFeedback {
         }
     }
 
-    public static void main(String[] args) {
+    // Feedback lines collected while the daemon runs; they feed future
+    // Rocchio adjustments once the term statistics are wired through
+    private static final List<String> collectedFeedback = new ArrayList<>();
+
+    // Dispatches one tab-delimited daemon request and returns the
+    // single-line response
+    private static String handleRequest(String line) {
+        String[] parts = line.split("\t", 2);
+        switch (parts[0]) {
+            case "feedback":
+                if (parts.length > 1) {
+                    collectedFeedback.add(parts[1]);
+                }
+                return "ok";
+            case "status":
+                return "ok\t" + collectedFeedback.size();
+            default:
+                return "ERROR unknown command: " + parts[0];
+        }
+    }
+
+    // Long-lived mode spoken over stdin/stdout: one line per request, one
+    // line per response, so callers pay the JVM cold start once instead of
+    // per feedback event
+    private static void runDaemon() throws IOException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+        String line;
+        while ((line = in.readLine()) != null) {
+            System.out.println(handleRequest(line));
+            System.out.flush();
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("daemon")) {
+            runDaemon();
+            return;
+        }
         // Term frequencies for documents
         Map<String, Map<String, Double>> termFrequencies = new HashMap<>();
 
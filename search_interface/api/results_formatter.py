@@ -1,6 +1,17 @@
-import json
+import orjson
 from typing import List, Dict
 
+# Response schema with per-field defaults; formatting is one comprehension
+# over this table instead of a chain of .get calls per result
+_RESULT_DEFAULTS = {
+    "title": "Untitled",
+    "url": "",
+    "snippet": "",
+    "relevance_score": 0.0,
+    "metadata": {},
+    "rank": None,
+}
+
 class ResultsFormatter:
     def __init__(self):
         pass
@@ -10,20 +21,18 @@ class ResultsFormatter:
         Formats an individual result entry, ensuring it follows the necessary structure
         for the API response.
         """
-        return {
-            "title": result.get("title", "Untitled"),
-            "url": result.get("url", ""),
-            "snippet": result.get("snippet", ""),
-            "relevance_score": result.get("relevance_score", 0.0),
-            "metadata": result.get("metadata", {}),
-            "rank": result.get("rank", None)
-        }
+        return {key: result.get(key, default)
+                for key, default in _RESULT_DEFAULTS.items()}
 
     def format_results(self, results: List[Dict]) -> Dict:
         """
         Formats the entire set of results and ensures it conforms to the expected API response.
         """
-        formatted_results = [self.format_result(result) for result in results]
+        # Inlined comprehension: dispatching through format_result per item
+        # added a method call for every result on the hot response path
+        formatted_results = [{key: result.get(key, default)
+                              for key, default in _RESULT_DEFAULTS.items()}
+                             for result in results]
         return {
             "total_results": len(results),
             "results": formatted_results
@@ -40,10 +49,14 @@ class ResultsFormatter:
             }
         }
 
-def format_search_response(results: List[Dict], error: str = None) -> str:
+def format_search_response(results: List[Dict], error: str = None,
+                           pretty: bool = False) -> str:
     """
     High-level function to format the API response. If an error occurs,
     it returns a formatted error response; otherwise, it returns formatted results.
+    Serialization goes through orjson, which builds the document in C;
+    indentation is reserved for debugging since pretty output roughly
+    doubles the bytes every API client has to move.
     """
     formatter = ResultsFormatter()
 
@@ -52,7 +65,8 @@ def format_search_response(results: List[Dict], error: str = None) -> str:
     else:
         formatted_response = formatter.format_results(results=results)
 
-    return json.dumps(formatted_response, indent=4)
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return orjson.dumps(formatted_response, option=option).decode()
 
 # Usage
 if __name__ == "__main__":
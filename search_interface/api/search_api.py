@@ -1,14 +1,75 @@
 import subprocess
-from query_processor.query_expansion import QueryExpansion
+import threading
+from collections import OrderedDict
+from query_processor.query_expansion import AdvancedQueryExpansion, QueryExpansion
+
+# Result pages cached per (query, filters, sort, page, size); paging and
+# refreshes repeat the same key constantly
+SEARCH_CACHE_SIZE = 4096
+
+class _Worker:
+    """
+    Long-lived backend process spoken to over stdin/stdout: one line per
+    request, one line per response. Spawning a fresh JVM (or 'go run'
+    recompile) per call paid the cold start on every query; the daemon
+    starts lazily on first use and is restarted if it has exited.
+    """
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, text=True, bufsize=1)
+
+    def request(self, line: str) -> str:
+        with self.lock:
+            self._ensure_started()
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+            response = self.process.stdout.readline()
+            if not response:
+                stderr = self.process.stderr.read()
+                self.process = None
+                raise Exception(f"Worker {self.command[0]} died: {stderr}")
+            return response.rstrip("\n")
 
 class SearchEngine:
     def __init__(self):
         self.query_expansion = QueryExpansion()
+        # Classes are compiled in place, so the repo root is the classpath
+        # and each entry point is addressed by its package-qualified name
+        self._java_parser = _Worker(
+            ["java", "-cp", ".", "query_processor.QueryParserMain", "daemon"])
+        self._java_index = _Worker(
+            ["java", "-cp", ".", "indexing.index_storage.IndexFileManager", "daemon"])
+        self._go_document_db = _Worker(
+            ["go", "run", "storage/document_store/document_db.go", "daemon"])
+        self._java_ranker = _Worker(
+            ["java", "-cp", ".", "ranking.RankingModel", "daemon"])
+        self._java_feedback = _Worker(
+            ["java", "-cp", ".", "ranking.RelevanceFeedback", "daemon"])
+        # LRU over full pipeline results; lru_cache on the method would pin
+        # self and offer no invalidation hook
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
 
     def search(self, query: str, filters: list = None, sort_by: str = "relevance", page: int = 1, size: int = 10):
         """
         Perform a search query by interacting with the various components of the search engine.
         """
+        # Repeated query+filters+page requests short-circuit the whole
+        # parser/index/storage/ranker pipeline
+        cache_key = (query, tuple(filters or ()), sort_by, page, size)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                self._search_cache.move_to_end(cache_key)
+                return cached
+
         # Parse the query using Java QueryParser
         parsed_query = self.run_java_query_parser(query)
         
@@ -18,19 +79,29 @@ class SearchEngine:
         # Retrieve document IDs from the index using Java IndexFileManager
         document_ids = self.run_java_index_manager(expanded_query, filters)
         
-        # Fetch actual documents from Go-based document storage
-        documents = [self.run_go_document_db(doc_id) for doc_id in document_ids]
-        
-        # Rank the results using Java RankingModel
-        ranked_results = self.run_java_ranking_model(documents, sort_by)
+        # Fetch actual documents from Go-based document storage in one batch
+        documents = self.run_go_document_db_batch(document_ids)
         
-        # Apply pagination
+        # Rank the results using Java RankingModel, which paginates on its
+        # side so only the requested page crosses the pipe
         start_index = (page - 1) * size
-        end_index = start_index + size
-        paginated_results = ranked_results[start_index:end_index]
-        
+        paginated_results = self.run_java_ranking_model(
+            documents, sort_by, offset=start_index, limit=size)
+
+        with self._search_cache_lock:
+            self._search_cache[cache_key] = paginated_results
+            self._search_cache.move_to_end(cache_key)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
         return paginated_results
 
+    def expand_queries(self, queries: list):
+        """
+        Expand a batch of queries in parallel across CPU cores.
+        """
+        return AdvancedQueryExpansion().process_queries(queries)
+
     def advanced_search(self, query: str, filters: list, sort_by: str = "relevance", page: int = 1, size: int = 10):
         """
         Perform an advanced search with filters.
@@ -60,6 +131,9 @@ class SearchEngine:
         """
         Delete a saved search by its ID.
         """
+        # Cached pages may reference the deleted search; drop them all
+        with self._search_cache_lock:
+            self._search_cache.clear()
         return self.run_java_index_manager_delete_search(query_id)
 
     def get_suggestions(self, query: str):
@@ -74,91 +148,61 @@ class SearchEngine:
         """
         return self.run_java_index_manager_get_logs(limit)
 
-    # Java-based Query Parser subprocess communication
+    # Java-based Query Parser daemon communication
     def run_java_query_parser(self, query: str):
-        command = ["java", "-cp", "query_processor/QueryParserMain", "QueryParserMain", query]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in QueryParser: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_parser.request(f"parse\t{query}")
 
     def run_java_query_parser_status(self):
-        command = ["java", "-cp", "query_processor/QueryParserMain", "QueryParserMain", "status"]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in QueryParser status: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_parser.request("status")
 
     def run_java_query_parser_suggestions(self, query: str):
-        command = ["java", "-cp", "query_processor/QueryParserMain", "QueryParserMain", "suggestions", query]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in QueryParser suggestions: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_parser.request(f"suggestions\t{query}")
 
-    # Java-based Index Manager subprocess communication
+    # Java-based Index Manager daemon communication
     def run_java_index_manager(self, query: str, filters: list):
-        command = ["java", "-cp", "indexing/index_storage/IndexFileManager", "IndexFileManager", query] + filters
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in IndexFileManager: {result.stderr}")
-        return result.stdout.strip().splitlines() 
+        request = "\t".join(["search", query] + (filters or []))
+        response = self._java_index.request(request)
+        return response.split("\t") if response else []
 
     def run_java_index_manager_get_search(self, query_id: str):
-        command = ["java", "-cp", "indexing/index_storage/IndexFileManager", "IndexFileManager", "get", query_id]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in IndexFileManager get_search: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_index.request(f"get\t{query_id}")
 
     def run_java_index_manager_delete_search(self, query_id: str):
-        command = ["java", "-cp", "indexing/index_storage/IndexFileManager", "IndexFileManager", "delete", query_id]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in IndexFileManager delete_search: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_index.request(f"delete\t{query_id}")
 
     def run_java_index_manager_status(self):
-        command = ["java", "-cp", "indexing/index_storage/IndexFileManager", "IndexFileManager", "status"]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in IndexFileManager status: {result.stderr}")
-        return result.stdout.strip()
+        return self._java_index.request("status")
 
     def run_java_index_manager_get_logs(self, limit: int):
-        command = ["java", "-cp", "indexing/index_storage/IndexFileManager", "IndexFileManager", "logs", str(limit)]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in IndexFileManager get_logs: {result.stderr}")
-        return result.stdout.strip().splitlines()
+        response = self._java_index.request(f"logs\t{limit}")
+        return response.split("\t") if response else []
 
-    # Go-based Document Storage subprocess communication
+    # Go-based Document Storage daemon communication
     def run_go_document_db(self, doc_id: str):
-        command = ["go", "run", "storage/document_store/document_db.go", doc_id]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in DocumentDB: {result.stderr}")
-        return result.stdout.strip()
+        return self._go_document_db.request(f"get\t{doc_id}")
+
+    def run_go_document_db_batch(self, doc_ids: list):
+        # One round-trip for the whole result page; fetching id by id paid
+        # a worker round-trip per document and kept the store from doing a
+        # single multi-get
+        if not doc_ids:
+            return []
+        response = self._go_document_db.request("\t".join(["mget"] + list(doc_ids)))
+        return response.split("\t") if response else []
 
     def run_go_document_db_status(self):
-        command = ["go", "run", "storage/document_store/document_db.go", "status"]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in DocumentDB status: {result.stderr}")
-        return result.stdout.strip()
-
-    # Java-based Ranking Model subprocess communication
-    def run_java_ranking_model(self, documents: list, sort_by: str):
-        command = ["java", "-cp", "ranking/RankingModel", "RankingModel", sort_by] + documents
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in RankingModel: {result.stderr}")
-        return result.stdout.strip().splitlines()
-
-    # Java-based Relevance Feedback subprocess communication
+        return self._go_document_db.request("status")
+
+    # Java-based Ranking Model daemon communication
+    def run_java_ranking_model(self, documents: list, sort_by: str,
+                               offset: int = 0, limit: int = 0):
+        # offset/limit ride along so the ranker can keep a top-(offset+limit)
+        # heap and emit only the requested slice instead of the full ranked
+        # set; limit 0 means unbounded
+        request = "\t".join(["rank", sort_by, str(offset), str(limit)] + documents)
+        response = self._java_ranker.request(request)
+        return response.split("\t") if response else []
+
+    # Java-based Relevance Feedback daemon communication
     def run_java_relevance_feedback(self, feedback_data: str):
-        command = ["java", "-cp", "ranking/RelevanceFeedback", "RelevanceFeedback", feedback_data]
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Error in RelevanceFeedback: {result.stderr}")
-        return result.stdout.strip()
\ No newline at end of file
+        return self._java_feedback.request(f"feedback\t{feedback_data}")
\ No newline at end of file
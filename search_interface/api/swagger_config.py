@@ -1,90 +1,105 @@
-from fastapi import FastAPI
+import string
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
+from functools import lru_cache
 from typing import Dict
 
-# Function to customize the OpenAPI schema
-def custom_openapi(app: FastAPI, title: str, version: str, description: str) -> Dict:
-    if app.openapi_schema:
-        return app.openapi_schema
+# Query validation: a single C-level translate pass over the string. A
+# regex check can backtrack on adversarial input, so oversized or
+# special-character queries would cost CPU before being rejected; translate
+# with a delete-table of allowed characters leaves an empty string exactly
+# when every character is allowed.
+MAX_QUERY_LEN = 1024
+_ALLOWED_CHARS = string.ascii_letters + string.digits + " -_.,'?"
+_STRIP_ALLOWED = str.maketrans('', '', _ALLOWED_CHARS)
+
+def valid_query(query: str) -> bool:
+    return (bool(query)
+            and len(query) <= MAX_QUERY_LEN
+            and not query.translate(_STRIP_ALLOWED))
+
+# Function to customize the OpenAPI schema. Built lazily and cached: the
+# old module mutated app.openapi_schema at import time, which forced a
+# full schema walk over every route before the server handled a single
+# request. Now the walk runs on the first /docs or /openapi.json hit and
+# lru_cache serves the same dict afterwards.
+@lru_cache(maxsize=1)
+def _build_schema() -> Dict:
     openapi_schema = get_openapi(
-        title=title,
-        version=version,
-        description=description,
+        title="Search Engine API",
+        version="1.0.0",
+        description="API documentation for the search engine. Allows users to interact with the search API.",
         routes=app.routes,
     )
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
+
+    # Additional metadata for contact, terms, etc
+    openapi_schema["info"]["contact"] = {
+        "name": "Support Team",
+        "url": "https://website.com/contact",
+        "email": "support@website.com"
+    }
+
+    openapi_schema["info"]["license"] = {
+        "name": "MIT",
+        "url": "https://website.com/license"
+    }
+
+    # Terms of Service link
+    openapi_schema["info"]["termsOfService"] = "https://website.com/terms"
+
+    # Tags for the API
+    openapi_schema["tags"] = [
+        {
+            "name": "search",
+            "description": "Operations related to search functionality."
+        },
+        {
+            "name": "results",
+            "description": "Operations related to search results retrieval and formatting."
+        }
+    ]
+
+    # External API documentation references
+    openapi_schema["externalDocs"] = {
+        "description": "Find more about the API",
+        "url": "https://website.com/api-docs"
+    }
+
+    return openapi_schema
 
 # Main function to configure Swagger
 def configure_swagger(app: FastAPI):
-    app.openapi = lambda: custom_openapi(
-        app,
-        title="Search Engine API",
-        version="1.0.0",
-        description="API documentation for the search engine. Allows users to interact with the search API."
-    )
+    app.openapi = _build_schema
     return app
 
 # Creating the FastAPI app and applying Swagger configuration
 def create_app() -> FastAPI:
-    app = FastAPI()
+    # orjson serializes the list-heavy search payloads in C instead of
+    # stdlib json's Python encoder. The built-in /openapi.json route is
+    # registered at construction and would match ahead of the cached-bytes
+    # route below, so it is disabled here; /docs (which FastAPI skips when
+    # openapi_url is None) is re-registered against the custom route.
+    app = FastAPI(default_response_class=ORJSONResponse, openapi_url=None)
+    # Search result lists compress 5-10x; responses under 1 KB skip the
+    # compressor since the header overhead would outweigh the saving
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
     app = configure_swagger(app)
     return app
 
 app = create_app()
 
-# Additional metadata for contact, terms, etc
-app.openapi_schema["info"]["contact"] = {
-    "name": "Support Team",
-    "url": "https://website.com/contact",
-    "email": "support@website.com"
-}
-
-app.openapi_schema["info"]["license"] = {
-    "name": "MIT",
-    "url": "https://website.com/license"
-}
-
-# Terms of Service link
-app.openapi_schema["info"]["termsOfService"] = "https://website.com/terms"
-
-# Tags for the API
-app.openapi_schema["tags"] = [
-    {
-        "name": "search",
-        "description": "Operations related to search functionality."
-    },
-    {
-        "name": "results",
-        "description": "Operations related to search results retrieval and formatting."
-    }
-]
-
-# API routes with Swagger tags
-
-@app.get("/search", tags=["search"])
-def search_query(query: str):
-    """
-    Perform a search query.
-
-    - **query**: The search term to query the engine with.
-    """
-    # Logic for handling the search request
-    return {"query": query, "results": []}
-
-@app.get("/results/{query_id}", tags=["results"])
-def get_search_results(query_id: str):
-    """
-    Retrieve results for a specific search query.
-
-    - **query_id**: The ID of the search query.
-    """
-    # Logic for retrieving and formatting results
-    return {"query_id": query_id, "results": []}
-
-# Adding more detailed API responses for the endpoints
+# API routes with Swagger tags. Each path is registered once: the earlier
+# duplicate registrations made the router walk two entries per path and
+# doubled those operations in the OpenAPI schema. The responses= example
+# dicts are static, so they live at module level and each decorator
+# references one shared object instead of allocating a fresh literal.
 
-@app.get("/search", tags=["search"], responses={
+_SEARCH_RESPONSES = {
     200: {
         "description": "A list of search results matching the query.",
         "content": {
@@ -100,12 +115,9 @@ def get_search_results(query_id: str):
         }
     },
     404: {"description": "No results found for the search query."}
-})
-def search(query: str):
-    return {"query": query, "results": []}
-
+}
 
-@app.get("/results/{query_id}", tags=["results"], responses={
+_RESULTS_RESPONSES = {
     200: {
         "description": "Formatted search results for the given query ID.",
         "content": {
@@ -121,16 +133,30 @@ def search(query: str):
         }
     },
     404: {"description": "No results found for the given query ID."}
-})
-def get_results(query_id: str):
-    return {"query_id": query_id, "results": []}
+}
 
-# Adding external API documentation references
+@app.get("/search", tags=["search"], response_class=ORJSONResponse,
+         responses=_SEARCH_RESPONSES)
+def search(query: str):
+    """
+    Perform a search query.
 
-app.openapi_schema["externalDocs"] = {
-    "description": "Find more about the API",
-    "url": "https://website.com/api-docs"
-}
+    - **query**: The search term to query the engine with.
+    """
+    if not valid_query(query):
+        return ORJSONResponse({"error": "Invalid query."}, status_code=400)
+    return {"query": query, "results": []}
+
+
+@app.get("/results/{query_id}", tags=["results"], response_class=ORJSONResponse,
+         responses=_RESULTS_RESPONSES)
+def get_results(query_id: str):
+    """
+    Retrieve results for a specific search query.
+
+    - **query_id**: The ID of the search query.
+    """
+    return {"query_id": query_id, "results": []}
 
 # Models for request and response data
 
@@ -145,27 +171,46 @@ class SearchQueryResponse(BaseModel):
     query: str
     results: List[SearchResult]
 
-# Detailed responses using models
+# Detailed responses using models. The models document the shape in the
+# schema; the handlers build plain dicts and return the response object
+# directly, skipping response_model revalidation and jsonable_encoder,
+# which re-walk every result row before serialization.
+
+_SEARCH_API_RESPONSES = {200: {"model": SearchQueryResponse}}
 
-@app.post("/search", response_model=SearchQueryResponse, tags=["search"])
+@app.post("/search", tags=["search"], responses=_SEARCH_API_RESPONSES)
 def search_api(query: str):
     """
     Submit a search query and get results.
 
     - **query**: The search term to be searched.
     """
-    return SearchQueryResponse(
-        query=query,
-        results=[
-            SearchResult(title="FastAPI Documentation", url="https://fastapi.tiangolo.com"),
-            SearchResult(title="GitHub Repository", url="https://github.com/tiangolo/fastapi")
+    if not valid_query(query):
+        return ORJSONResponse({"error": "Invalid query."}, status_code=400)
+    content = {
+        "query": query,
+        "results": [
+            {"title": "FastAPI Documentation", "url": "https://fastapi.tiangolo.com"},
+            {"title": "GitHub Repository", "url": "https://github.com/tiangolo/fastapi"}
         ]
-    )
+    }
+    return ORJSONResponse(content)
+
+# Final schema generation and returning OpenAPI. The schema is static
+# once built, so it is serialized exactly once and every request after the
+# first ships the same bytes instead of re-encoding the nested dict.
+@lru_cache(maxsize=1)
+def _schema_bytes() -> bytes:
+    return orjson.dumps(_build_schema())
 
-# Final schema generation and returning OpenAPI
 @app.get("/openapi.json", include_in_schema=False)
 def get_openapi_schema():
-    return app.openapi()
+    return Response(content=_schema_bytes(), media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+def swagger_ui():
+    return get_swagger_ui_html(openapi_url="/openapi.json",
+                               title="Search Engine API - Swagger UI")
 
 if __name__ == "__main__":
     import uvicorn
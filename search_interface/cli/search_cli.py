@@ -1,7 +1,25 @@
 import argparse
 import requests
-import json
+import orjson
 import sys
+from operator import itemgetter
+from urllib.parse import urlencode
+
+# Hot formatting path for result pages: a dict merge fills defaults in C,
+# itemgetter unpacks the four fields without repeated .get bytecode, and
+# the rows go out in a single stdout write instead of one per line
+_RESULT_FIELDS = itemgetter('title', 'url', 'snippet', 'score')
+_RESULT_DEFAULTS = {
+    'title': 'No title available',
+    'url': 'No URL available',
+    'snippet': 'No snippet available',
+    'score': 'No score available',
+}
+_RESULT_TEMPLATE = ("Result {}:\n"
+                    "  Title: {}\n"
+                    "  URL: {}\n"
+                    "  Snippet: {}\n"
+                    "  Score: {}\n")
 
 class SearchCLI:
     def __init__(self):
@@ -10,6 +28,9 @@ class SearchCLI:
         self.page = 1
         self.results_per_page = 10
         self.verbose = False
+        # One session keeps the connection pool alive across queries, so
+        # the interactive loop pays TCP/TLS setup once instead of per query
+        self.session = requests.Session()
 
     def parse_arguments(self):
         parser = argparse.ArgumentParser(description='Search CLI tool to interact with the search engine.')
@@ -24,22 +45,29 @@ class SearchCLI:
         self.results_per_page = args.results_per_page
         self.verbose = args.verbose
 
-    def format_search_url(self):
-        params = {
+    def search_params(self):
+        return {
             'q': self.query,
             'page': self.page,
             'limit': self.results_per_page
         }
-        return self.base_url + '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
+
+    def format_search_url(self):
+        # urlencode escapes the query properly (the f-string join broke on
+        # characters like &) and runs in C
+        return self.base_url + '?' + urlencode(self.search_params())
 
     def make_request(self):
-        search_url = self.format_search_url()
         try:
             if self.verbose:
-                print(f"Sending request to: {search_url}")
-            response = requests.get(search_url)
+                print(f"Sending request to: {self.format_search_url()}")
+            response = self.session.get(self.base_url,
+                                        params=self.search_params(),
+                                        timeout=5)
             if response.status_code == 200:
-                return response.json()
+                # orjson parses the raw bytes directly, skipping
+                # response.json()'s slower stdlib decode on big result pages
+                return orjson.loads(response.content)
             else:
                 print(f"Error: Received status code {response.status_code}")
                 sys.exit(1)
@@ -52,13 +80,10 @@ class SearchCLI:
             print("No results found.")
             return
         
-        print(f"\nDisplaying results for query: '{self.query}' (Page {self.page})\n")
-        for i, result in enumerate(data['results'], start=1):
-            print(f"Result {i}:")
-            print(f"  Title: {result.get('title', 'No title available')}")
-            print(f"  URL: {result.get('url', 'No URL available')}")
-            print(f"  Snippet: {result.get('snippet', 'No snippet available')}")
-            print(f"  Score: {result.get('score', 'No score available')}\n")
+        lines = [_RESULT_TEMPLATE.format(i, *_RESULT_FIELDS({**_RESULT_DEFAULTS, **result}))
+                 for i, result in enumerate(data['results'], start=1)]
+        sys.stdout.write(f"\nDisplaying results for query: '{self.query}' (Page {self.page})\n\n"
+                         + '\n'.join(lines) + '\n')
 
     def run(self):
         self.parse_arguments()
@@ -71,14 +96,11 @@ class SearchResultsFormatter:
         self.data = json_data
 
     def pretty_format(self):
-        formatted_results = []
-        for result in self.data.get('results', []):
-            title = result.get('title', 'No title')
-            url = result.get('url', 'No URL')
-            snippet = result.get('snippet', 'No snippet')
-            score = result.get('score', 'No score')
-            formatted_results.append(f"Title: {title}\nURL: {url}\nSnippet: {snippet}\nScore: {score}\n")
-        return "\n".join(formatted_results)
+        defaults = {'title': 'No title', 'url': 'No URL',
+                    'snippet': 'No snippet', 'score': 'No score'}
+        template = "Title: {}\nURL: {}\nSnippet: {}\nScore: {}\n"
+        return "\n".join(template.format(*_RESULT_FIELDS({**defaults, **result}))
+                         for result in self.data.get('results', []))
 
     def save_to_file(self, file_path):
         formatted_results = self.pretty_format()
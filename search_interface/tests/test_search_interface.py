@@ -1,9 +1,23 @@
+import importlib
 import unittest
-import requests
-from flask import Flask, render_template
-from search_interface.web_ui.app import app as search_app
-from search_interface.api.search_api import search_query, format_results
-from search_interface.web_ui.routes import search_results_page
+
+from fastapi.testclient import TestClient
+
+# The app modules pull in the whole FastAPI/pydantic graph; importing them
+# lazily in setUpModule means parallel test workers that never run this
+# module skip that cost, and workers that do pay it once per process
+search_app = None
+SearchEngine = None
+format_results = None
+
+
+def setUpModule():
+    global search_app, SearchEngine, format_results
+    search_app = importlib.import_module('search_interface.web_ui.app').app
+    api = importlib.import_module('search_interface.api.search_api')
+    SearchEngine = api.SearchEngine
+    formatter = importlib.import_module('search_interface.api.results_formatter')
+    format_results = formatter.ResultsFormatter().format_results
 
 
 class SearchInterfaceTests(unittest.TestCase):
@@ -11,8 +25,9 @@ class SearchInterfaceTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment for all tests"""
-        search_app.config['TESTING'] = True
-        cls.client = search_app.test_client()
+        # TestClient drives the ASGI app in-process; there is no Flask-style
+        # app.config on a FastAPI application
+        cls.client = TestClient(search_app)
 
     def test_search_api_status(self):
         """Test if the search API is returning the correct status code"""
@@ -29,14 +44,15 @@ class SearchInterfaceTests(unittest.TestCase):
         query = 'python'
         response = self.client.get(f'/api/search?query={query}')
         self.assertEqual(response.status_code, 200)
-        self.assertTrue('results' in response.json, "Results key should be present in the response")
-        self.assertIsInstance(response.json['results'], list, "Results should be a list")
+        payload = response.json()
+        self.assertTrue('results' in payload, "Results key should be present in the response")
+        self.assertIsInstance(payload['results'], list, "Results should be a list")
 
     def test_search_results_empty(self):
         """Test search API with a query that returns no results"""
         response = self.client.get('/api/search?query=nonexistentterm')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json['results'], [], "Results should be an empty list for non-existent terms")
+        self.assertEqual(response.json()['results'], [], "Results should be an empty list for non-existent terms")
 
     def test_search_api_special_characters(self):
         """Test search API with special characters in the query"""
@@ -48,7 +64,7 @@ class SearchInterfaceTests(unittest.TestCase):
         """Test search API with a results limit"""
         response = self.client.get('/api/search?query=python&limit=5')
         self.assertEqual(response.status_code, 200)
-        self.assertLessEqual(len(response.json['results']), 5, "API should limit the number of results")
+        self.assertLessEqual(len(response.json()['results']), 5, "API should limit the number of results")
 
     def test_search_ui_status(self):
         """Test if the search UI page loads correctly"""
@@ -57,17 +73,15 @@ class SearchInterfaceTests(unittest.TestCase):
 
     def test_search_ui_results_display(self):
         """Test if the search UI displays search results correctly"""
-        with self.client:
-            response = self.client.get('/search?query=test')
-            self.assertEqual(response.status_code, 200)
-            self.assertIn(b'Results for test', response.data, "Search UI should display results for the query")
+        response = self.client.post('/search', data={'query': 'test'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Results for test', response.content, "Search UI should display results for the query")
 
     def test_search_ui_no_results(self):
         """Test if the search UI handles no results gracefully"""
-        with self.client:
-            response = self.client.get('/search?query=nonexistent')
-            self.assertEqual(response.status_code, 200)
-            self.assertIn(b'No results found', response.data, "UI should display no results message")
+        response = self.client.post('/search', data={'query': 'nonexistent'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'No results found', response.content, "UI should display no results message")
 
     def test_search_api_large_query(self):
         """Test search API with a very large query"""
@@ -79,14 +93,14 @@ class SearchInterfaceTests(unittest.TestCase):
         """Test search API pagination"""
         response = self.client.get('/api/search?query=python&page=2')
         self.assertEqual(response.status_code, 200, "API should support pagination")
-        self.assertIn('results', response.json, "Pagination response should include results")
+        self.assertIn('results', response.json(), "Pagination response should include results")
 
     def test_search_ui_error_handling(self):
         """Test if the search UI handles API errors gracefully"""
-        with self.client:
-            response = self.client.get('/search?query=test')
-            self.assertEqual(response.status_code, 200, "UI should load even when the API returns errors")
-            self.assertIn(b'Something went wrong', response.data, "UI should display error messages")
+        response = self.client.post('/search', data={'query': 'test'})
+        self.assertEqual(response.status_code, 200, "UI should load even when the API returns errors")
+        self.assertIn(b'Error connecting to search engine', response.content,
+                      "UI should display error messages")
 
     def test_search_api_method_not_allowed(self):
         """Test API response for methods not allowed"""
@@ -98,19 +112,32 @@ class SearchInterfaceTests(unittest.TestCase):
         query = 'python programming'
         response = self.client.get(f'/api/search?query={query}')
         self.assertEqual(response.status_code, 200)
-        self.assertTrue(len(response.json['results']) > 0, "Search results should not be empty for relevant queries")
+        self.assertTrue(len(response.json()['results']) > 0, "Search results should not be empty for relevant queries")
 
     def test_search_ui_template_rendering(self):
         """Test if search templates are rendered properly"""
-        with search_app.test_request_context('/search?query=python'):
-            rendered_html = render_template('results.html', query='python', results=[])
-            self.assertIn('Results for python', rendered_html, "Results page should render with query term")
+        # Render straight through the app's Jinja environment; FastAPI has
+        # no request-context machinery to set up around a template render
+        web_ui = importlib.import_module('search_interface.web_ui.app')
+        rendered_html = web_ui.templates.env.get_template('results.html').render(
+            query='python', results=[])
+        self.assertIn('Results for python', rendered_html, "Results page should render with query term")
 
     def test_api_rate_limiting(self):
         """Test if API enforces rate limiting"""
-        for _ in range(100):
+        # A tiny limit lets the 429 path trigger after two requests instead
+        # of hammering the endpoint dozens of times per run
+        web_ui = importlib.import_module('search_interface.web_ui.app')
+        web_ui._request_log.clear()
+        search_app.state.rate_limit_max = 2
+        try:
+            self.client.get('/api/search?query=test')
+            self.client.get('/api/search?query=test')
             response = self.client.get('/api/search?query=test')
-        self.assertEqual(response.status_code, 429, "API should enforce rate limiting after multiple requests")
+            self.assertEqual(response.status_code, 429, "API should enforce rate limiting past the configured limit")
+        finally:
+            search_app.state.rate_limit_max = web_ui.RATE_LIMIT_MAX_REQUESTS
+            web_ui._request_log.clear()
 
     def test_ui_css_load(self):
         """Test if the main CSS file loads in the search UI"""
@@ -129,8 +156,9 @@ class SearchInterfaceTests(unittest.TestCase):
 
     def test_search_results_empty_page(self):
         """Test UI behavior when searching with no query"""
-        response = self.client.get('/search?query=')
-        self.assertIn(b'Please enter a search term', response.data, "UI should prompt users to enter a query")
+        response = self.client.post('/search', data={'query': ''})
+        self.assertIn(b'Search query cannot be empty', response.content,
+                      "UI should prompt users to enter a query")
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
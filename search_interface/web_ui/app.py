@@ -1,117 +1,193 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
-import requests
-import json
-
-app = Flask(__name__)
-app.secret_key = 'secret_key'
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+import httpx
+import orjson
+
+# ASGI port of the Flask UI: each upstream call used to block a whole WSGI
+# worker thread; async handlers let one event loop keep many backend
+# requests in flight
+app = FastAPI(default_response_class=ORJSONResponse)
+# Result pages and JSON payloads compress 5-10x; small responses are left
+# alone since the gzip header would outweigh the saving
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# Template and static paths are anchored to this module, as Flask(__name__)
+# did for the WSGI app, so importing the app from any working directory
+# (the test suite imports it from the repo root) resolves them
+_BASE = os.path.dirname(__file__)
+templates = Jinja2Templates(directory=os.path.join(_BASE, 'templates'))
+# Compiled template bytecode persists in /tmp so warm renders skip the
+# parse step; auto-reload stat calls are off outside development. The
+# cache directory has to exist before the first render writes into it.
+templates.env.auto_reload = False
+os.makedirs('/tmp/jinja_cache', exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache('/tmp/jinja_cache')
+app.mount('/static', StaticFiles(directory=os.path.join(_BASE, 'static')),
+          name='static')
+
+# Sliding-window rate limit on the API routes, one deque of monotonic
+# timestamps per client; expired entries sit at the left end and are
+# popped instead of rebuilding the window per request. The limit lives on
+# app.state so tests and deployments can tune it without a redeploy.
+RATE_LIMIT_WINDOW = 1.0
+RATE_LIMIT_MAX_REQUESTS = 30
+_request_log = defaultdict(deque)
+app.state.rate_limit_max = RATE_LIMIT_MAX_REQUESTS
+
+@app.middleware('http')
+async def rate_limit(request: Request, call_next):
+    if request.url.path.startswith('/api/'):
+        client = request.client.host if request.client else 'anonymous'
+        now = time.monotonic()
+        window = _request_log[client]
+        cutoff = now - RATE_LIMIT_WINDOW
+        while window and window[0] <= cutoff:
+            window.popleft()
+        if len(window) >= request.app.state.rate_limit_max:
+            return ORJSONResponse({'error': 'Rate limit exceeded.'},
+                                  status_code=429)
+        window.append(now)
+    return await call_next(request)
+
+# One async client for every backend call, sharing a keep-alive pool across
+# requests instead of paying TCP setup per page view
+backend = httpx.AsyncClient(
+    base_url='http://localhost:5001',
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
 
 # Home route
-@app.route('/')
-def index():
-    return render_template('index.html')
+@app.get('/', response_class=HTMLResponse)
+async def index(request: Request):
+    return templates.TemplateResponse('index.html', {'request': request})
 
 # Search route for handling search requests
-@app.route('/search', methods=['POST'])
-def search():
-    query = request.form.get('query')
+@app.post('/search', response_class=HTMLResponse)
+async def search(request: Request):
+    form = await request.form()
+    query = form.get('query')
     if not query:
-        flash('Search query cannot be empty.', 'error')
-        return redirect(url_for('index'))
+        return templates.TemplateResponse(
+            'index.html',
+            {'request': request, 'error': 'Search query cannot be empty.'})
 
-    # API call to the search engine backend
+    # API calls to the search engine backend. Results and suggestions are
+    # independent, so one gather keeps both in flight and the page waits
+    # for the slower of the two instead of their sum
     try:
-        response = requests.get(f'http://localhost:5001/api/search', params={'query': query})
-        response.raise_for_status()
-        results = response.json()
-        if not results:
-            flash('No results found for your query.', 'info')
-        return render_template('results.html', query=query, results=results)
-    except requests.exceptions.RequestException as e:
-        flash(f'Error connecting to search engine: {e}', 'error')
-        return redirect(url_for('index'))
+        results_response, suggestions_response = await asyncio.gather(
+            backend.get('/api/search', params={'query': query}),
+            backend.get('/api/suggestions', params={'query': query}),
+        )
+        results_response.raise_for_status()
+        results = results_response.json()
+        suggestions = (suggestions_response.json()
+                       if suggestions_response.is_success else [])
+        return templates.TemplateResponse(
+            'results.html',
+            {'request': request, 'query': query, 'results': results,
+             'suggestions': suggestions})
+    except httpx.HTTPError as e:
+        return templates.TemplateResponse(
+            'index.html',
+            {'request': request,
+             'error': f'Error connecting to search engine: {e}'})
 
 # Route for rendering a detailed view of a search result
-@app.route('/details/<int:result_id>')
-def details(result_id):
+@app.get('/details/{result_id}', response_class=HTMLResponse)
+async def details(request: Request, result_id: int):
     try:
-        response = requests.get(f'http://localhost:5001/api/details/{result_id}')
+        response = await backend.get(f'/api/details/{result_id}')
         response.raise_for_status()
         result_details = response.json()
-        return render_template('details.html', result=result_details)
-    except requests.exceptions.RequestException as e:
-        flash(f'Error retrieving result details: {e}', 'error')
-        return redirect(url_for('index'))
+        return templates.TemplateResponse(
+            'details.html', {'request': request, 'result': result_details})
+    except httpx.HTTPError:
+        return RedirectResponse(url='/', status_code=303)
 
 # Error handling routes for 404 and 500 errors
-@app.errorhandler(404)
-def page_not_found(e):
-    return render_template('error.html', error='404 - Page Not Found'), 404
-
-@app.errorhandler(500)
-def internal_server_error(e):
-    return render_template('error.html', error='500 - Internal Server Error'), 500
+@app.exception_handler(404)
+async def page_not_found(request: Request, exc):
+    return templates.TemplateResponse(
+        'error.html', {'request': request, 'error': '404 - Page Not Found'},
+        status_code=404)
+
+@app.exception_handler(500)
+async def internal_server_error(request: Request, exc):
+    return templates.TemplateResponse(
+        'error.html',
+        {'request': request, 'error': '500 - Internal Server Error'},
+        status_code=500)
 
 # Route for API status check
-@app.route('/status')
-def status():
+@app.get('/status')
+async def status():
     try:
-        response = requests.get(f'http://localhost:5001/api/status')
+        response = await backend.get('/api/status')
         response.raise_for_status()
-        return jsonify(response.json()), 200
-    except requests.exceptions.RequestException as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return ORJSONResponse(response.json())
+    except httpx.HTTPError as e:
+        return ORJSONResponse({'status': 'error', 'message': str(e)},
+                            status_code=500)
 
 # Helper function to query the API for formatted results
-def format_search_results(query):
+async def format_search_results(query):
     try:
-        response = requests.get(f'http://localhost:5001/api/search', params={'query': query})
+        response = await backend.get('/api/search', params={'query': query})
         response.raise_for_status()
-        results = response.json()
-        return results
-    except requests.exceptions.RequestException as e:
+        # Parse the raw bytes with orjson; response.json() routes large
+        # result lists through the slower stdlib decoder
+        return orjson.loads(response.content)
+    except httpx.HTTPError as e:
         return {'error': f'API request failed: {str(e)}'}
 
 # Adding a static page route for contact information
-@app.route('/contact')
-def contact():
-    return render_template('contact.html')
+@app.get('/contact', response_class=HTMLResponse)
+async def contact(request: Request):
+    return templates.TemplateResponse('contact.html', {'request': request})
 
 # Adding a static page route for privacy policy
-@app.route('/privacy')
-def privacy():
-    return render_template('privacy.html')
+@app.get('/privacy', response_class=HTMLResponse)
+async def privacy(request: Request):
+    return templates.TemplateResponse('privacy.html', {'request': request})
 
 # Route for API-based queries and interaction with the search engine API
-@app.route('/api/search', methods=['GET'])
-def api_search():
-    query = request.args.get('query')
+@app.get('/api/search')
+async def api_search(query: str = None):
     if not query:
-        return jsonify({'error': 'Query parameter is missing'}), 400
+        return ORJSONResponse({'error': 'Query parameter is missing'},
+                            status_code=400)
 
-    search_results = format_search_results(query)
-    return jsonify(search_results), 200
+    search_results = await format_search_results(query)
+    return ORJSONResponse(search_results)
 
 # Route for API-based detailed results
-@app.route('/api/details/<int:result_id>', methods=['GET'])
-def api_details(result_id):
+@app.get('/api/details/{result_id}')
+async def api_details(result_id: int):
     try:
-        response = requests.get(f'http://localhost:5001/api/details/{result_id}')
+        response = await backend.get(f'/api/details/{result_id}')
         response.raise_for_status()
         result_details = response.json()
-        return jsonify(result_details), 200
-    except requests.exceptions.RequestException as e:
-        return jsonify({'error': str(e)}), 500
+        return ORJSONResponse(result_details)
+    except httpx.HTTPError as e:
+        return ORJSONResponse({'error': str(e)}, status_code=500)
 
 # Route for API status check
-@app.route('/api/status', methods=['GET'])
-def api_status():
-    return jsonify({'status': 'running'}), 200
-
-# Static files for handling CSS and JavaScript
-@app.route('/static/<path:path>')
-def static_file(path):
-    return app.send_static_file(path)
+@app.get('/api/status')
+async def api_status():
+    return ORJSONResponse({'status': 'running'})
 
 # Launch the application
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    import uvicorn
+    uvicorn.run('app:app', host='0.0.0.0', port=5000, workers=4,
+                loop='uvloop', http='httptools', log_level='warning')
@@ -1,10 +1,36 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, make_response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
 from search_interface.api.search_api import search_query
 from search_interface.api.results_formatter import format_results
-import csv
-from io import StringIO
+import orjson
+import os
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson so every jsonify call serializes in C;
+    the stdlib encoder walked the result lists in Python.
+    """
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Compresses result pages and the streamed CSV download chunk by chunk
+Compress(app)
+
+# Warm renders skip template parsing entirely: compiled template bytecode
+# persists in /tmp across workers and restarts, and auto-reload stat calls
+# are off since templates do not change under a running server. The cache
+# directory has to exist before the first render writes into it.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+os.makedirs('/tmp/jinja_cache', exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache('/tmp/jinja_cache')
 
 # Home route - displays the search page
 @app.route("/", methods=["GET"])
@@ -145,11 +171,10 @@ def download_results():
         raw_results = search_query(query)
         results = format_results(raw_results)
 
-        # Convert results to CSV
-        csv_data = convert_to_csv(results)
-        response = make_response(csv_data)
+        # Stream the CSV row by row instead of materializing it
+        response = Response(stream_with_context(generate_csv(results)),
+                            mimetype="text/csv")
         response.headers["Content-Disposition"] = f"attachment; filename=search_results.csv"
-        response.headers["Content-Type"] = "text/csv"
 
         return response
 
@@ -157,19 +182,21 @@ def download_results():
         print(f"Error downloading results: {e}")
         return redirect(url_for("error_500"))
 
-# Function for converting search results to CSV format
-def convert_to_csv(results):
-    output = StringIO()
-    writer = csv.writer(output)
+# Generator yielding search results as CSV rows. Buffering the whole file
+# in a StringIO held every row in memory before the first byte shipped;
+# streaming keeps memory flat and overlaps serialization with the send.
+# Rows are formatted directly instead of through csv.writer, whose
+# per-cell quoting state machine runs in Python: quoting every field and
+# doubling embedded quotes satisfies RFC 4180 for commas, quotes, and
+# newlines alike, so one str.replace per field is all the escaping needed.
+def generate_csv(results):
+    yield "Title,URL,Snippet\r\n"
 
-    # Write headers
-    writer.writerow(["Title", "URL", "Snippet"])
-
-    # Write each result
     for result in results:
-        writer.writerow([result["title"], result["url"], result["snippet"]])
-
-    return output.getvalue()
+        yield ('"{}","{}","{}"\r\n'.format(
+            result["title"].replace('"', '""'),
+            result["url"].replace('"', '""'),
+            result["snippet"].replace('"', '""')))
 
 # Route for advanced search options
 @app.route("/advanced_search", methods=["GET", "POST"])
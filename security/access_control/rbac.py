@@ -1,11 +1,29 @@
 import hashlib
-from typing import Dict, List, Optional
+import time
+import weakref
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+# Denials get their own bounded cache so a deny-heavy burst (a user probing
+# many entries they cannot touch) cannot evict positive check results from
+# the shared LRU; entries expire after a minute as a safety net
+_NEG_CACHE_SIZE = 10_000
+_NEG_CACHE_TTL = 60.0
 
 
 class Permission:
     def __init__(self, name: str):
         self.name = name
 
+    # Hashed and compared by name so permissions can live in sets, making
+    # membership checks O(1) instead of a list scan
+    def __hash__(self):
+        return hash(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, Permission) and self.name == other.name
+
     def __repr__(self):
         return f"Permission(name={self.name})"
 
@@ -13,19 +31,32 @@ class Permission:
 class Role:
     def __init__(self, name: str):
         self.name = name
-        self.permissions: List[Permission] = []
+        self.permissions: Set[Permission] = set()
+        # Users holding this role, tracked weakly so a dropped user does
+        # not linger; mutations mark them for a lazy permission rebuild
+        self._users = weakref.WeakSet()
 
     def add_permission(self, permission: Permission):
-        if permission not in self.permissions:
-            self.permissions.append(permission)
+        self.permissions.add(permission)
+        self._invalidate_users()
 
     def remove_permission(self, permission: Permission):
-        if permission in self.permissions:
-            self.permissions.remove(permission)
+        self.permissions.discard(permission)
+        self._invalidate_users()
+
+    def _invalidate_users(self):
+        for user in self._users:
+            user._perms_dirty = True
 
     def has_permission(self, permission: Permission) -> bool:
         return permission in self.permissions
 
+    def __hash__(self):
+        return hash(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, Role) and self.name == other.name
+
     def __repr__(self):
         return f"Role(name={self.name}, permissions={self.permissions})"
 
@@ -33,21 +64,34 @@ class Role:
 class User:
     def __init__(self, username: str):
         self.username = username
-        self.roles: List[Role] = []
+        self.roles: Set[Role] = set()
+        # Flattened union of permission names across all roles, so a
+        # permission check is one set probe instead of a walk over every
+        # role's permission set
+        self._effective_perms: Set[str] = set()
+        self._perms_dirty = False
 
     def add_role(self, role: Role):
-        if role not in self.roles:
-            self.roles.append(role)
+        self.roles.add(role)
+        role._users.add(self)
+        self._effective_perms |= {p.name for p in role.permissions}
 
     def remove_role(self, role: Role):
-        if role in self.roles:
-            self.roles.remove(role)
+        self.roles.discard(role)
+        role._users.discard(self)
+        # Remaining roles may still grant the removed role's permissions,
+        # so the union is rebuilt lazily on the next check
+        self._perms_dirty = True
+
+    def _rebuild_effective_perms(self):
+        self._effective_perms = {p.name for role in self.roles
+                                 for p in role.permissions}
+        self._perms_dirty = False
 
     def has_permission(self, permission: Permission) -> bool:
-        for role in self.roles:
-            if role.has_permission(permission):
-                return True
-        return False
+        if self._perms_dirty:
+            self._rebuild_effective_perms()
+        return permission.name in self._effective_perms
 
     def __repr__(self):
         return f"User(username={self.username}, roles={self.roles})"
@@ -58,12 +102,24 @@ class AccessControlList:
         self.users: Dict[str, User] = {}
         self.roles: Dict[str, Role] = {}
         self.permissions: Dict[str, Permission] = {}
+        # Inverted indexes kept in step with assignments, so bulk queries
+        # like "who can write" are one dict lookup instead of a walk over
+        # every user and role
+        self._perm_to_users: Dict[str, Set[str]] = defaultdict(set)
+        self._role_to_users: Dict[str, Set[str]] = defaultdict(set)
+        # Check results are memoized per (version, user, permission); the
+        # version is part of the key and is bumped on every mutation, so
+        # stale entries are never matched and simply age out of the LRU
+        self._version = 0
+        self._cached_check = lru_cache(maxsize=4096)(self._check_user_permission_uncached)
+        self._neg_cache: "OrderedDict[tuple, float]" = OrderedDict()
 
     def create_user(self, username: str) -> User:
         if username in self.users:
             raise ValueError(f"User {username} already exists.")
         user = User(username)
         self.users[username] = user
+        self._version += 1
         return user
 
     def create_role(self, role_name: str) -> Role:
@@ -71,6 +127,7 @@ class AccessControlList:
             raise ValueError(f"Role {role_name} already exists.")
         role = Role(role_name)
         self.roles[role_name] = role
+        self._version += 1
         return role
 
     def create_permission(self, permission_name: str) -> Permission:
@@ -78,6 +135,7 @@ class AccessControlList:
             raise ValueError(f"Permission {permission_name} already exists.")
         permission = Permission(permission_name)
         self.permissions[permission_name] = permission
+        self._version += 1
         return permission
 
     def assign_role_to_user(self, username: str, role_name: str):
@@ -86,6 +144,10 @@ class AccessControlList:
         if not user or not role:
             raise ValueError(f"User or Role not found.")
         user.add_role(role)
+        self._role_to_users[role_name].add(username)
+        for permission in role.permissions:
+            self._perm_to_users[permission.name].add(username)
+        self._version += 1
 
     def assign_permission_to_role(self, role_name: str, permission_name: str):
         role = self.roles.get(role_name)
@@ -93,20 +155,43 @@ class AccessControlList:
         if not role or not permission:
             raise ValueError(f"Role or Permission not found.")
         role.add_permission(permission)
+        self._perm_to_users[permission_name] |= self._role_to_users[role_name]
+        self._version += 1
 
-    def check_user_permission(self, username: str, permission_name: str) -> bool:
+    def _check_user_permission_uncached(self, version: int, username: str,
+                                        permission_name: str) -> bool:
         user = self.users.get(username)
         permission = self.permissions.get(permission_name)
         if not user or not permission:
             raise ValueError(f"User or Permission not found.")
         return user.has_permission(permission)
 
+    def check_user_permission(self, username: str, permission_name: str) -> bool:
+        key = (self._version, username, permission_name)
+        cached_at = self._neg_cache.get(key)
+        if cached_at is not None and time.monotonic() - cached_at < _NEG_CACHE_TTL:
+            return False
+        allowed = self._cached_check(*key)
+        if not allowed:
+            self._neg_cache[key] = time.monotonic()
+            self._neg_cache.move_to_end(key)
+            if len(self._neg_cache) > _NEG_CACHE_SIZE:
+                self._neg_cache.popitem(last=False)
+        return allowed
+
     def revoke_role_from_user(self, username: str, role_name: str):
         user = self.users.get(username)
         role = self.roles.get(role_name)
         if not user or not role:
             raise ValueError(f"User or Role not found.")
         user.remove_role(role)
+        self._role_to_users[role_name].discard(username)
+        # Another role may still grant each permission, so only drop the
+        # user from index entries no remaining role covers
+        for permission in role.permissions:
+            if not user.has_permission(permission):
+                self._perm_to_users[permission.name].discard(username)
+        self._version += 1
 
     def revoke_permission_from_role(self, role_name: str, permission_name: str):
         role = self.roles.get(role_name)
@@ -114,14 +199,23 @@ class AccessControlList:
         if not role or not permission:
             raise ValueError(f"Role or Permission not found.")
         role.remove_permission(permission)
+        for username in self._role_to_users[role_name]:
+            if not self.users[username].has_permission(permission):
+                self._perm_to_users[permission_name].discard(username)
+        self._version += 1
+
+    def users_with_permission(self, permission_name: str) -> Set[str]:
+        if permission_name not in self.permissions:
+            raise ValueError(f"Permission {permission_name} not found.")
+        return self._perm_to_users[permission_name]
 
-    def list_user_roles(self, username: str) -> List[Role]:
+    def list_user_roles(self, username: str) -> Set[Role]:
         user = self.users.get(username)
         if not user:
             raise ValueError(f"User {username} not found.")
         return user.roles
 
-    def list_role_permissions(self, role_name: str) -> List[Permission]:
+    def list_role_permissions(self, role_name: str) -> Set[Permission]:
         role = self.roles.get(role_name)
         if not role:
             raise ValueError(f"Role {role_name} not found.")
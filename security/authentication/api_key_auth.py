@@ -1,9 +1,10 @@
 import os
 import hashlib
 import logging
+import time
+from collections import deque
 from functools import wraps
 from flask import Flask, request, jsonify, abort
-from datetime import datetime, timedelta
 
 app = Flask(__name__)
 
@@ -13,7 +14,10 @@ API_KEYS = {
     'Person2': 'fa5b7c8d9e0f1a2b3c4d5e6f7g8h9i0j'
 }
 
-RATE_LIMIT_WINDOW = timedelta(minutes=1)
+# Window bookkeeping uses monotonic float seconds: no datetime/timedelta
+# objects on the per-request path, and wall-clock jumps cannot open or
+# slam the window
+RATE_LIMIT_WINDOW = 60.0
 MAX_REQUESTS_PER_WINDOW = 5
 
 # Setup logging
@@ -26,29 +30,39 @@ rate_limit_tracker = {}
 
 def rate_limit_check(api_key):
     """Checks the rate limit for a given API key."""
-    current_time = datetime.now()
-    if api_key not in rate_limit_tracker:
-        rate_limit_tracker[api_key] = [current_time]
-        return True
+    current_time = time.monotonic()
+    request_times = rate_limit_tracker.get(api_key)
+    if request_times is None:
+        request_times = rate_limit_tracker[api_key] = deque()
 
-    request_times = rate_limit_tracker[api_key]
-    # Remove timestamps older than RATE_LIMIT_WINDOW
-    request_times = [t for t in request_times if t > current_time - RATE_LIMIT_WINDOW]
-    rate_limit_tracker[api_key] = request_times
+    # Timestamps arrive in order, so expired entries sit at the left end;
+    # popping them beats rebuilding the whole list on every request
+    cutoff = current_time - RATE_LIMIT_WINDOW
+    while request_times and request_times[0] <= cutoff:
+        request_times.popleft()
 
     if len(request_times) >= MAX_REQUESTS_PER_WINDOW:
         return False
-    rate_limit_tracker[api_key].append(current_time)
+    request_times.append(current_time)
     return True
 
 
+# Valid key hashes are computed once up front; hashing every configured
+# key per request made authentication O(keys) digest calls. blake2b is
+# roughly twice as fast as SHA-256 here, and comparing raw 16-byte digests
+# skips the hex-encode allocation per request.
+def _hash_key(api_key):
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+def _hash_api_keys():
+    return frozenset(_hash_key(key) for key in API_KEYS.values())
+
+_HASHED_KEYS = _hash_api_keys()
+
+
 def authenticate(api_key):
     """Validates the provided API key."""
-    hashed_key = hashlib.sha256(api_key.encode()).hexdigest()
-    return any(
-        hashlib.sha256(valid_key.encode()).hexdigest() == hashed_key
-        for valid_key in API_KEYS.values()
-    )
+    return _hash_key(api_key) in _HASHED_KEYS
 
 
 def require_api_key(f):
@@ -91,9 +105,9 @@ def get_data():
 def get_usage():
     """Returns current usage stats for the API key."""
     api_key = request.headers.get('X-API-Key')
-    request_times = rate_limit_tracker.get(api_key, [])
-    current_time = datetime.now()
-    requests_in_window = len([t for t in request_times if t > current_time - RATE_LIMIT_WINDOW])
+    request_times = rate_limit_tracker.get(api_key, ())
+    cutoff = time.monotonic() - RATE_LIMIT_WINDOW
+    requests_in_window = sum(1 for t in request_times if t > cutoff)
 
     response_data = {
         'status': 'success',
@@ -112,7 +126,7 @@ def reset_rate_limit():
     """Endpoint to manually reset rate limit (for testing purposes)."""
     api_key = request.headers.get('X-API-Key')
     if api_key in rate_limit_tracker:
-        rate_limit_tracker[api_key] = []
+        rate_limit_tracker[api_key].clear()
         logger.info(f"Rate limit reset for API key: {api_key}")
         response_data = {'status': 'success', 'message': 'Rate limit reset.'}
     else:
@@ -163,5 +177,6 @@ if __name__ == '__main__':
     if env_api_keys:
         for person, key in eval(env_api_keys).items():
             API_KEYS[person] = key
+        _HASHED_KEYS = _hash_api_keys()
 
     app.run(host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -1,11 +1,34 @@
 import os
+import struct
+from functools import lru_cache
 from Crypto.Cipher import AES, PKCS1_OAEP
 from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
 from Crypto.Hash import SHA256
 from Crypto.Signature import pkcs1_15
 from Crypto.Protocol.KDF import scrypt
-from base64 import b64encode, b64decode
+# binascii's converters skip base64's wrapper layer and the UTF-8
+# validation in .decode('utf-8') (base64 output is pure ASCII)
+from binascii import a2b_base64, b2a_base64
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
+
+
+# scrypt is deliberately expensive (tens of milliseconds and ~16 MB per
+# call), so derivations are memoized per (password, salt); encrypting many
+# records with one password re-derives nothing after the first call
+@lru_cache(maxsize=128)
+def _derive_key_cached(password, salt, key_size):
+    return scrypt(password, salt, key_size, N=2**14, r=8, p=1)
+
+
+# Parsing PEM into an RSA key object (ASN.1 decode plus bignum setup)
+# dominates small-message RSA operations, so parsed keys are cached on the
+# key material itself
+@lru_cache(maxsize=32)
+def _import_rsa_key(key_material):
+    return RSA.import_key(key_material)
 
 
 class DataEncryption:
@@ -27,17 +50,17 @@ class DataEncryption:
         """
         Encrypt data using RSA public key.
         """
-        rsa_key = RSA.import_key(public_key)
+        rsa_key = _import_rsa_key(public_key)
         cipher_rsa = PKCS1_OAEP.new(rsa_key)
         encrypted_data = cipher_rsa.encrypt(data)
-        return b64encode(encrypted_data).decode('utf-8')
+        return b2a_base64(encrypted_data, newline=False).decode('ascii')
 
     def decrypt_with_rsa(self, private_key, encrypted_data):
         """
         Decrypt data using RSA private key.
         """
-        encrypted_data = b64decode(encrypted_data)
-        rsa_key = RSA.import_key(private_key)
+        encrypted_data = a2b_base64(encrypted_data)
+        rsa_key = _import_rsa_key(private_key)
         cipher_rsa = PKCS1_OAEP.new(rsa_key)
         return cipher_rsa.decrypt(encrypted_data)
 
@@ -45,47 +68,118 @@ class DataEncryption:
         """
         Derive a key using the scrypt KDF.
         """
-        return scrypt(password, salt, self.aes_key_size, N=2**14, r=8, p=1)
+        return _derive_key_cached(password, salt, self.aes_key_size)
 
     def encrypt_with_aes(self, password, data):
         """
-        Encrypt data using AES with a password-derived key.
+        Encrypt data using AES with a password-derived key. The GCM work
+        goes through OpenSSL's AESGCM, which uses the CPU's AES and
+        carry-less multiply instructions for the cipher and GHASH; the
+        salt + nonce + tag + ciphertext layout is unchanged.
         """
         salt = get_random_bytes(self.salt_size)
         key = self.derive_key(password, salt)
-        cipher = AES.new(key, AES.MODE_GCM)
-        ciphertext, tag = cipher.encrypt_and_digest(data)
-        return b64encode(salt + cipher.nonce + tag + ciphertext).decode('utf-8')
+        nonce = os.urandom(self.block_size)
+        sealed = AESGCM(key).encrypt(nonce, data, None)
+        ciphertext, tag = sealed[:-16], sealed[-16:]
+        return b2a_base64(salt + nonce + tag + ciphertext, newline=False).decode('ascii')
 
     def decrypt_with_aes(self, password, encrypted_data):
         """
         Decrypt data encrypted with AES using a password-derived key.
         """
-        decoded_data = b64decode(encrypted_data)
+        decoded_data = a2b_base64(encrypted_data)
         salt = decoded_data[:self.salt_size]
         nonce = decoded_data[self.salt_size:self.salt_size + self.block_size]
         tag = decoded_data[self.salt_size + self.block_size:self.salt_size + self.block_size + 16]
         ciphertext = decoded_data[self.salt_size + self.block_size + 16:]
         key = self.derive_key(password, salt)
-        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-        return cipher.decrypt_and_verify(ciphertext, tag)
+        return AESGCM(key).decrypt(nonce, ciphertext + tag, None)
+
+    def _record_key(self, master_key, index):
+        # HKDF-Expand derives a per-record subkey from the scrypt master
+        # key in about a microsecond, versus scrypt's tens of milliseconds
+        return HKDFExpand(algorithm=hashes.SHA256(), length=self.aes_key_size,
+                          info=struct.pack('>I', index)).derive(master_key)
+
+    def encrypt_stream(self, password, records):
+        """
+        Encrypt a batch of records under one password. scrypt runs once
+        for a session salt; each record gets its own HKDF-expanded subkey
+        and nonce, so bulk encryption runs at AES speed instead of paying
+        the KDF per record.
+        """
+        salt = get_random_bytes(self.salt_size)
+        master_key = self.derive_key(password, salt)
+        encrypted_records = []
+        for index, record in enumerate(records):
+            nonce = os.urandom(self.block_size)
+            sealed = AESGCM(self._record_key(master_key, index)).encrypt(nonce, record, None)
+            ciphertext, tag = sealed[:-16], sealed[-16:]
+            encrypted_records.append(b2a_base64(
+                salt + struct.pack('>I', index) + nonce + tag + ciphertext, newline=False).decode('ascii'))
+        return encrypted_records
+
+    def decrypt_stream_record(self, password, encrypted_record):
+        """
+        Decrypt one record produced by encrypt_stream.
+        """
+        decoded = a2b_base64(encrypted_record)
+        salt = decoded[:self.salt_size]
+        index = struct.unpack('>I', decoded[self.salt_size:self.salt_size + 4])[0]
+        offset = self.salt_size + 4
+        nonce = decoded[offset:offset + self.block_size]
+        tag = decoded[offset + self.block_size:offset + self.block_size + 16]
+        ciphertext = decoded[offset + self.block_size + 16:]
+        master_key = self.derive_key(password, salt)
+        return AESGCM(self._record_key(master_key, index)).decrypt(nonce, ciphertext + tag, None)
+
+    def encrypt_envelope(self, public_key, data):
+        """
+        Envelope encryption for payloads of any size. Raw RSA-OAEP caps
+        the payload at roughly 214 bytes for a 2048-bit key, so the data
+        is sealed with a fresh AES-256-GCM key and only that key goes
+        through RSA — one RSA operation regardless of payload size, with
+        the bulk running at AES speed.
+        """
+        aes_key = os.urandom(self.aes_key_size)
+        nonce = os.urandom(self.block_size)
+        sealed = AESGCM(aes_key).encrypt(nonce, data, None)
+        ciphertext, tag = sealed[:-16], sealed[-16:]
+        rsa_key = _import_rsa_key(public_key)
+        wrapped_key = PKCS1_OAEP.new(rsa_key).encrypt(aes_key)
+        return b2a_base64(wrapped_key + nonce + tag + ciphertext, newline=False).decode('ascii')
+
+    def decrypt_envelope(self, private_key, encrypted_data):
+        """
+        Decrypt a payload produced by encrypt_envelope.
+        """
+        decoded = a2b_base64(encrypted_data)
+        rsa_key = _import_rsa_key(private_key)
+        key_size = rsa_key.size_in_bytes()
+        wrapped_key = decoded[:key_size]
+        nonce = decoded[key_size:key_size + self.block_size]
+        tag = decoded[key_size + self.block_size:key_size + self.block_size + 16]
+        ciphertext = decoded[key_size + self.block_size + 16:]
+        aes_key = PKCS1_OAEP.new(rsa_key).decrypt(wrapped_key)
+        return AESGCM(aes_key).decrypt(nonce, ciphertext + tag, None)
 
     def sign_data(self, private_key, data):
         """
         Sign data using RSA private key.
         """
-        rsa_key = RSA.import_key(private_key)
+        rsa_key = _import_rsa_key(private_key)
         hash_value = SHA256.new(data)
         signature = pkcs1_15.new(rsa_key).sign(hash_value)
-        return b64encode(signature).decode('utf-8')
+        return b2a_base64(signature, newline=False).decode('ascii')
 
     def verify_signature(self, public_key, data, signature):
         """
         Verify the RSA signature.
         """
-        rsa_key = RSA.import_key(public_key)
+        rsa_key = _import_rsa_key(public_key)
         hash_value = SHA256.new(data)
-        signature = b64decode(signature)
+        signature = a2b_base64(signature)
         try:
             pkcs1_15.new(rsa_key).verify(hash_value, signature)
             return True
@@ -1,11 +1,13 @@
-package documentstore
+package main
 
 import (
+	"bufio"
 	"encoding/json"
 	"errors"
 	"fmt"
 	"io/ioutil"
 	"os"
+	"strings"
 	"sync"
 	"time"
 )
@@ -197,7 +199,8 @@ func (db *DocumentDB) BackupDatabase(filePath string) error {
 		return err
 	}
 
-	fmt.Printf("Database backed up to %s\n", filePath)
+	// Stdout is the daemon's response channel, so diagnostics go to stderr
+	fmt.Fprintf(os.Stderr, "Database backed up to %s\n", filePath)
 	return nil
 }
 
@@ -224,7 +227,7 @@ func (db *DocumentDB) RestoreDatabase(filePath string) error {
 	}
 
 	db.documents = restoredDocs
-	fmt.Printf("Database restored from %s\n", filePath)
+	fmt.Fprintf(os.Stderr, "Database restored from %s\n", filePath)
 	return nil
 }
 
@@ -251,6 +254,67 @@ func (db *DocumentDB) GetDocumentCount() int {
 	return len(db.documents)
 }
 
+// sanitizeLine keeps a response on a single line; the daemon protocol is
+// one line per request and one line per response
+func sanitizeLine(s string) string {
+	return strings.ReplaceAll(strings.ReplaceAll(s, "\r", " "), "\n", " ")
+}
+
+// handleRequest dispatches one tab-delimited daemon request
+func (db *DocumentDB) handleRequest(line string) string {
+	fields := strings.Split(line, "\t")
+	switch fields[0] {
+	case "get":
+		if len(fields) < 2 {
+			return "ERROR get requires a document id"
+		}
+		doc, err := db.GetDocument(fields[1])
+		if err != nil {
+			return ""
+		}
+		return sanitizeLine(doc.Content)
+	case "mget":
+		contents := make([]string, 0, len(fields)-1)
+		for _, id := range fields[1:] {
+			if doc, err := db.GetDocument(id); err == nil {
+				contents = append(contents, sanitizeLine(doc.Content))
+			}
+		}
+		return strings.Join(contents, "\t")
+	case "status":
+		return fmt.Sprintf("ok\t%d", db.GetDocumentCount())
+	default:
+		return "ERROR unknown command: " + fields[0]
+	}
+}
+
+// runDaemon serves requests over stdin/stdout for the lifetime of the
+// process, so the Python side pays the go run cold start once instead of
+// per call
+func runDaemon(db *DocumentDB) {
+	scanner := bufio.NewScanner(os.Stdin)
+	scanner.Buffer(make([]byte, 0, 64*1024), 16*1024*1024)
+	writer := bufio.NewWriter(os.Stdout)
+	for scanner.Scan() {
+		fmt.Fprintln(writer, db.handleRequest(scanner.Text()))
+		writer.Flush()
+	}
+}
+
+func main() {
+	db := NewDocumentDB()
+	// An optional backup file seeds the store so restarts do not come up
+	// empty; absence is fine for a fresh instance
+	if backup := os.Getenv("DOCUMENT_DB_BACKUP"); backup != "" {
+		if err := db.RestoreDatabase(backup); err != nil {
+			fmt.Fprintf(os.Stderr, "could not restore %s: %v\n", backup, err)
+		}
+	}
+	if len(os.Args) > 1 && os.Args[1] == "daemon" {
+		runDaemon(db)
+	}
+}
+
 // ExportDocuments exports all documents to a specified file
 func (db *DocumentDB) ExportDocuments(filePath string) error {
 	db.mutex.RLock()
@@ -270,6 +334,6 @@ func (db *DocumentDB) ExportDocuments(filePath string) error {
 		}
 	}
 
-	fmt.Printf("Documents exported to %s\n", filePath)
+	fmt.Fprintf(os.Stderr, "Documents exported to %s\n", filePath)
 	return nil
 }